@@ -0,0 +1,65 @@
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cps_audio import create_audio
+
+
+def write_click(path, rate=44100, duration=0.03):
+    frames = int(rate * duration)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        samples = (int(12000 * math.sin(2 * math.pi * 1800 * i / rate) * (1 - i / frames))
+                   for i in range(frames))
+        wav.writeframes(b''.join(struct.pack('<h', s) for s in samples))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def report(label, costs):
+    print(f"{label:<22} mean {sum(costs) / len(costs):8.1f}us  "
+          f"p50 {percentile(costs, 0.5):8.1f}us  p99 {percentile(costs, 0.99):8.1f}us")
+
+
+def main():
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    path = os.path.join(tempfile.mkdtemp(), 'click.wav')
+    write_click(path)
+
+    audio = create_audio({'click': path})
+    if not audio.available:
+        print("No audio backend available")
+        return
+    import pygame
+
+    legacy = []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        pygame.mixer.Sound.play(pygame.mixer.Sound(path))
+        legacy.append((time.perf_counter() - start) * 1e6)
+
+    bank = []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        audio.play('click')
+        bank.append((time.perf_counter() - start) * 1e6)
+
+    print(f"Click sound dispatch cost over {clicks} clicks")
+    report("load per click", legacy)
+    report("preloaded bank", bank)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cps_core import GameCore, MODES
+from cps_synth import click_stream
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_timed(mode, timestamps):
+    core = GameCore(mode=mode, time_limit=30)
+    core.start(timestamps[0])
+    costs = []
+    perf = time.perf_counter_ns
+    wall = perf()
+    for t in timestamps:
+        if core.expired(t):
+            break
+        start = perf()
+        core.click(t)
+        costs.append(perf() - start)
+    wall = perf() - wall
+    core.end(timestamps[-1])
+    return costs, wall
+
+
+def run_traced(mode, timestamps):
+    core = GameCore(mode=mode, time_limit=30)
+    core.start(timestamps[0])
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    clicks = 0
+    for t in timestamps:
+        if core.expired(t):
+            break
+        core.click(t)
+        clicks += 1
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / max(1, clicks), peak - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed synthetic click streams through the headless game core")
+    parser.add_argument('--clicks', type=int, default=20000, help="clicks per scenario")
+    parser.add_argument('--rates', type=float, nargs='+', default=[10, 100, 10000])
+    parser.add_argument('--jitter', type=float, default=0.2, help="relative interval jitter for the jittered runs")
+    args = parser.parse_args()
+
+    print(f"{'mode':<14} {'cps':>7} {'stream':<8} {'clicks':>7} {'p50 ns':>8} {'p95 ns':>8} "
+          f"{'p99 ns':>8} {'max ns':>9} {'clicks/s':>11} {'B/click':>8} {'peak KiB':>9}")
+    for mode in MODES:
+        for cps in args.rates:
+            for label, jitter in (('exact', 0.0), ('jitter', args.jitter)):
+                timestamps = list(click_stream(cps, count=args.clicks, jitter=jitter, seed=1))
+                costs, wall = run_timed(mode, timestamps)
+                per_click, peak = run_traced(mode, timestamps)
+                costs.sort()
+                throughput = len(costs) / (wall / 1e9) if wall else 0
+                print(f"{mode:<14} {cps:>7.0f} {label:<8} {len(costs):>7} {percentile(costs, 0.5):>8} "
+                      f"{percentile(costs, 0.95):>8} {percentile(costs, 0.99):>8} {costs[-1]:>9} "
+                      f"{throughput:>11.0f} {per_click:>8.1f} {peak / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
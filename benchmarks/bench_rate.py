@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cps_engine import RateEngine
+
+
+def legacy_cps(click_times, now):
+    recent_clicks = [t for t in click_times if now - t <= 1.0]
+    return len(recent_clicks)
+
+
+def bench_engine(total_clicks, cps, samples):
+    engine = RateEngine()
+    interval = 1.0 / cps
+    costs = []
+    for i in range(total_clicks):
+        t = i * interval
+        if i >= total_clicks - samples:
+            start = time.perf_counter_ns()
+            engine.record(t)
+            engine.cps(t)
+            costs.append(time.perf_counter_ns() - start)
+        else:
+            engine.record(t)
+    return sum(costs) / len(costs)
+
+
+def bench_legacy(total_clicks, cps, samples):
+    click_times = deque(maxlen=1000)
+    interval = 1.0 / cps
+    costs = []
+    for i in range(total_clicks):
+        t = i * interval
+        if i >= total_clicks - samples:
+            start = time.perf_counter_ns()
+            click_times.append(t)
+            legacy_cps(click_times, t)
+            costs.append(time.perf_counter_ns() - start)
+        else:
+            click_times.append(t)
+    return sum(costs) / len(costs)
+
+
+def main():
+    cps = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    samples = 1000
+    print(f"Per-click cost at {cps:.0f} CPS (mean of last {samples} clicks)")
+    print(f"{'clicks':>10} {'engine ns':>12} {'legacy ns':>12}")
+    for total_clicks in (1_000, 10_000, 100_000, 1_000_000):
+        engine_ns = bench_engine(total_clicks, cps, samples)
+        legacy_ns = bench_legacy(total_clicks, cps, samples)
+        print(f"{total_clicks:>10} {engine_ns:>12.0f} {legacy_ns:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import MODULE
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in ('matplotlib', 'pygame', 'numpy') if name in sys.modules]
+print(f"{elapsed:.2f} {','.join(heavy) or '-'}")
+"""
+
+
+def measure_import(runs, module='cps'):
+    times, heavy = [], set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', IMPORT_PROBE.replace('MODULE', module)], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        if out[1] != '-':
+            heavy.update(out[1].split(','))
+    return statistics.median(times), heavy
+
+
+def measure_interactive(runs, extra_args):
+    interactive, ready = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, 'cps.py', '--exit-when-ready'] + extra_args,
+                             cwd=ROOT, capture_output=True, text=True, timeout=120).stdout
+        match = re.search(r'Interactive after (\d+)ms', out)
+        if not match:
+            return None, None
+        interactive.append(int(match.group(1)))
+        match = re.search(r'Backends ready after (\d+)ms', out)
+        if match:
+            ready.append(int(match.group(1)))
+    return statistics.median(interactive), (statistics.median(ready) if ready else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cps.py import time and time-to-interactive")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help="fail if the median import time exceeds this budget")
+    args = parser.parse_args()
+
+    failed = False
+    for module in ('cps', 'cps_term'):
+        import_ms, heavy = measure_import(args.runs, module)
+        print(f"import {module}: {import_ms:.1f}ms (median of {args.runs})")
+        if heavy:
+            print(f"  REGRESSION: importing {module} pulled in {', '.join(sorted(heavy))}")
+            failed = True
+        if args.max_import_ms is not None and import_ms > args.max_import_ms:
+            print(f"  REGRESSION: over the {args.max_import_ms:.0f}ms budget")
+            failed = True
+
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+        print("time-to-interactive: skipped (no DISPLAY)")
+    else:
+        for label, extra in (('full', []), ('headless', ['--headless'])):
+            interactive, ready = measure_interactive(args.runs, extra)
+            if interactive is None:
+                print(f"time-to-interactive ({label}): failed to start")
+                failed = True
+                continue
+            line = f"time-to-interactive ({label}): {interactive}ms"
+            if ready is not None:
+                line += f", backends ready: {ready}ms"
+            print(line)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
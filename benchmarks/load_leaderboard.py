@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cps_core import MODES, TIME_LIMITS
+from leaderboard_server import Leaderboard, LeaderboardServer
+
+
+def raise_fd_limit(wanted):
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, wanted))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def station(host, port, index, requests, batch, latencies, errors, start):
+    rng = random.Random(index)
+    try:
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    except OSError:
+        errors.append('connect')
+        return
+    await start.wait()
+    try:
+        for n in range(requests):
+            if n % 5 == 4:
+                payload = {'op': 'top', 'mode': rng.choice(MODES), 'time_limit': rng.choice(TIME_LIMITS), 'k': 10}
+            else:
+                payload = {'op': 'submit', 'sessions': [{
+                    'id': f"load-{index}-{n}-{i}",
+                    'station': f"station-{index}",
+                    'mode': rng.choice(MODES),
+                    'time_limit': rng.choice(TIME_LIMITS),
+                    'final_cps': rng.gauss(9, 2),
+                    'total_clicks': rng.randint(20, 300),
+                } for i in range(batch)]}
+            sent = time.perf_counter()
+            writer.write(json.dumps(payload).encode('utf-8') + b'\n')
+            await writer.drain()
+            line = await reader.readline()
+            latencies.append(time.perf_counter() - sent)
+            if not line or not json.loads(line).get('ok'):
+                errors.append('response')
+    except OSError:
+        errors.append('io')
+    finally:
+        writer.close()
+
+
+async def run(args):
+    server_task = None
+    host, port = args.host, args.port
+    if port == 0:
+        server = LeaderboardServer(Leaderboard())
+        ready = asyncio.get_running_loop().create_future()
+        server_task = asyncio.create_task(server.serve(host, 0, ready))
+        port = await ready
+
+    latencies, errors = [], []
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(station(host, port, i, args.requests, args.batch, latencies, errors, start))
+             for i in range(args.connections)]
+    await asyncio.sleep(0.5)
+    began = time.perf_counter()
+    start.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - began
+
+    if server_task is not None:
+        server_task.cancel()
+        try:
+            await server_task
+        except asyncio.CancelledError:
+            pass
+
+    latencies.sort()
+    print(f"{args.connections} connections x {args.requests} requests (batch {args.batch}) in {elapsed:.2f}s")
+    if latencies:
+        print(f"throughput: {len(latencies) / elapsed:.0f} req/s, "
+              f"{len(latencies) * args.batch * 4 / 5 / elapsed:.0f} sessions/s")
+        print(f"latency: p50 {percentile(latencies, 0.5) * 1000:.1f}ms, p95 {percentile(latencies, 0.95) * 1000:.1f}ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms")
+    print(f"errors: {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the leaderboard server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help="0 starts an in-process server on a free port")
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=20, help="requests per connection")
+    parser.add_argument('--batch', type=int, default=5, help="sessions per submit")
+    args = parser.parse_args()
+    raise_fd_limit(2 * args.connections + 64)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,155 @@
+import time
+
+PROCESS_START = time.perf_counter()
+
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import threading
-import time
+import queue
 import json
-import csv
 import os
+import argparse
+import functools
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from collections import deque
-import pygame
+from cps_graph import GraphRenderer, NullGraph
+from cps_audio import NullAudio, create_audio
+from cps_store import open_store
+from cps_core import GameCore, MODES, TIME_LIMITS
+from cps_view import ViewModel, next_refresh_delay
+from cps_clock import LoopScheduler
+from cps_io import PersistenceWorker, atomic_write_json
+from cps_input import InputLatency, KeyRepeatFilter, parse_keys
+from cps_replay import META_FIELDS, ReplayPlayer, load_replay, save_replay
+from cps_perf import NullMonitor, PerfMonitor, format_report
+from cps_multi import MultiplayerWindow
 
 class CPSClickerGame:
-    def __init__(self):
+    def __init__(self, graph_enabled=True, audio_enabled=True, exit_when_ready=False):
         self.root = tk.Tk()
         self.root.title("CPS Clicker Game")
         self.root.geometry("1200x800")
         self.root.configure(bg='#0a0a0a')
         self.root.resizable(True, True)
         
-        try:
-            pygame.mixer.init()
-        except:
-            print("Audio initialization failed - continuing without sound")
-        
-        self.clicks = 0
-        self.start_time = None
-        self.current_cps = 0
-        self.max_cps = 0
-        self.game_active = False
-        self.game_mode = "Time Trial"
-        self.time_limit = 10
-        self.click_times = deque(maxlen=1000)
-        self.session_data = []
+        self.graph_enabled = graph_enabled
+        self.audio_enabled = audio_enabled
+        self.exit_when_ready = exit_when_ready
+        self.audio = NullAudio()
+        self.backend_queue = queue.Queue()
+        self.ready_time = None
+        self.io = PersistenceWorker()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        self.core = GameCore()
+        self.scheduler = LoopScheduler(self.root, self.core.clock)
+        self.view = ViewModel()
+        self.display_after = None
+        self.pending_clicks = []
+        self.input_latency = InputLatency()
+        self.store = None
+        self.analytics = None
         self.settings = self.load_settings()
+        self.keys = KeyRepeatFilter(self.root, self.settings['click_keys'])
+        self.leaderboard = None
+        self.connect_leaderboard()
         self.game_timer = None
+        self.replay = None
+        self.replay_timer = None
+        self.replay_meta = {}
+        self.perf = NullMonitor()
+        self.perf_label = None
+        self.perf_after = None
+        self.export_job = None
+        self.figure_backend = None
+        self.multiplayer = None
         
         self.setup_ui()
+        if self.settings['perf_overlay']:
+            self.toggle_perf()
+        self.bind_view()
         self.update_display()
+        self.root.after_idle(self.on_interactive)
+        
+    def on_interactive(self):
+        self.ready_time = time.perf_counter()
+        print(f"Interactive after {(self.ready_time - PROCESS_START) * 1000:.0f}ms")
+        if self.graph_enabled or self.audio_enabled:
+            threading.Thread(target=self.load_backends, daemon=True).start()
+            self.root.after(50, self.poll_backends)
+        elif self.exit_when_ready:
+            self.root.after_idle(self.root.destroy)
+    
+    def load_backends(self):
+        # Only imports and mixer setup happen here; Tk widgets are created
+        # back on the main thread in poll_backends.
+        if self.audio_enabled:
+            self.backend_queue.put(('audio', create_audio()))
+        if self.graph_enabled:
+            try:
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+                self.backend_queue.put(('graph', (Figure, FigureCanvasTkAgg)))
+            except Exception as e:
+                print(f"Graph initialization failed - continuing without graph ({e})")
+        self.backend_queue.put(('done', None))
+    
+    def poll_backends(self):
+        while True:
+            try:
+                kind, backend = self.backend_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(50, self.poll_backends)
+                return
+            if kind == 'audio':
+                self.audio = backend
+            elif kind == 'graph':
+                self.attach_graph(*backend)
+            elif kind == 'done':
+                print(f"Backends ready after {(time.perf_counter() - PROCESS_START) * 1000:.0f}ms")
+                if self.exit_when_ready:
+                    self.root.after_idle(self.root.destroy)
+                return
         
     def load_settings(self):
+        settings = {
+            'theme': 'dark',
+            'sound_enabled': True,
+            'button_size': 'large',
+            'auto_detect': True,
+            'graph_fps': 30,
+            'save_timelines': True,
+            'replay_speed': 1,
+            'perf_overlay': False,
+            'multiplayer_players': [],
+            'click_keys': ['space'],
+            'leaderboard_address': '',
+            'station_name': ''
+        }
         try:
             with open('settings.json', 'r') as f:
-                return json.load(f)
-        except:
-            return {
-                'theme': 'dark',
-                'sound_enabled': True,
-                'button_size': 'large',
-                'auto_detect': True
-            }
+                settings.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Failed to load settings.json - using defaults ({e})")
+        return settings
+    
+    def connect_leaderboard(self):
+        outbox = None
+        if self.leaderboard is not None:
+            # The new client takes over the unsent sessions, so only one
+            # thread ever writes the outbox file.
+            outbox = self.leaderboard.detach()
+            self.leaderboard = None
+        if self.settings['leaderboard_address']:
+            from cps_leaderboard import LeaderboardClient
+            import socket
+            station = self.settings['station_name'] or socket.gethostname()
+            self.leaderboard = LeaderboardClient(self.settings['leaderboard_address'], station,
+                                                 outbox=outbox)
     
     def save_settings(self):
-        with open('settings.json', 'w') as f:
-            json.dump(self.settings, f)
+        self.io.submit('settings.json', atomic_write_json, 'settings.json', dict(self.settings))
     
     def setup_ui(self):
         main_frame = tk.Frame(self.root, bg='#0a0a0a')
@@ -78,6 +173,13 @@ class CPSClickerGame:
         
         self.create_control_panel(main_frame)
         
+    def bind_view(self):
+        self.view.bind('clicks', lambda text: self.clicks_label.config(text=text))
+        self.view.bind('cps', lambda text: self.cps_label.config(text=text))
+        self.view.bind('max_cps', lambda text: self.max_cps_label.config(text=text))
+        self.view.bind('avg_cps', lambda text: self.avg_cps_label.config(text=text))
+        self.view.bind('timer', lambda text: self.timer_label.config(text=text))
+        
     def create_header(self, parent):
         header_frame = tk.Frame(parent, bg='#0a0a0a')
         header_frame.pack(fill='x', pady=(0, 15))
@@ -87,7 +189,7 @@ class CPSClickerGame:
                         fg='#00ff00', bg='#0a0a0a')
         title.pack(side='left')
         
-        self.mode_label = tk.Label(header_frame, text=f"Mode: {self.game_mode}",
+        self.mode_label = tk.Label(header_frame, text=f"Mode: {self.core.game_mode}",
                                   font=('Courier New', 14),
                                   fg='#ffffff', bg='#0a0a0a')
         self.mode_label.pack(side='right')
@@ -102,9 +204,13 @@ class CPSClickerGame:
                                      activebackground='#00cc00',
                                      activeforeground='#000000',
                                      relief='raised', bd=6,
-                                     command=self.on_click,
                                      cursor='hand2')
         self.click_button.pack(fill='both', expand=True, padx=20, pady=20)
+        self.click_button.bind('<ButtonPress-1>', self.on_press)
+        self.root.bind('<KeyPress>', self.on_key_press)
+        self.root.bind('<KeyRelease>', self.on_key_release)
+        self.root.bind('<F3>', self.toggle_perf)
+        self.root.bind('<F4>', self.dump_perf)
         self.timer_label = tk.Label(parent, text="Game Ready - Click Start!",
                                    font=('Courier New', 16, 'bold'),
                                    fg='#ffffff', bg='#0a0a0a')
@@ -135,29 +241,42 @@ class CPSClickerGame:
         self.avg_cps_label = tk.Label(stats_frame, text="Average CPS: 0.0",
                                      font=('Courier New', 14),
                                      fg='#00ccff', bg='#1a1a1a')
-        self.avg_cps_label.pack(pady=(3, 10))
+        self.avg_cps_label.pack(pady=3)
+        
+        self.flag_label = tk.Label(stats_frame, text="",
+                                  font=('Courier New', 12, 'bold'),
+                                  fg='#ff3333', bg='#1a1a1a')
+        self.flag_label.pack(pady=(3, 10))
         
     def create_graph(self, parent):
-        graph_frame = tk.Frame(parent, bg='#1a1a1a', relief='raised', bd=3)
-        graph_frame.pack(fill='both', expand=True)
+        self.graph_frame = tk.Frame(parent, bg='#1a1a1a', relief='raised', bd=3)
+        self.graph_frame.pack(fill='both', expand=True)
         
-        tk.Label(graph_frame, text="Real-Time CPS Graph", font=('Courier New', 16, 'bold'),
+        tk.Label(self.graph_frame, text="Real-Time CPS Graph", font=('Courier New', 16, 'bold'),
                 fg='#00ff00', bg='#1a1a1a').pack(pady=(10, 5))
         
-        self.fig, self.ax = plt.subplots(figsize=(6, 4), facecolor='#1a1a1a')
-        self.ax.set_facecolor('#0a0a0a')
-        self.ax.set_xlim(0, 10)
-        self.ax.set_ylim(0, 25)
-        self.ax.set_xlabel('Time (Seconds)', color='white', fontsize=10)
-        self.ax.set_ylabel('Clicks Per Second', color='white', fontsize=10)
-        self.ax.tick_params(colors='white')
-        self.ax.grid(True, alpha=0.3, color='white')
+        status = "Loading Graph..." if self.graph_enabled else "Graph Disabled"
+        self.graph_placeholder = tk.Label(self.graph_frame, text=status,
+                                         font=('Courier New', 12),
+                                         fg='#666666', bg='#0a0a0a')
+        self.graph_placeholder.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        self.graph = NullGraph(fps=self.settings['graph_fps'])
+    
+    def attach_graph(self, Figure, FigureCanvasTkAgg):
+        self.graph_placeholder.destroy()
+        
+        self.fig = Figure(figsize=(6, 4), facecolor='#1a1a1a')
+        self.ax = self.fig.add_subplot()
         
-        self.canvas = FigureCanvasTkAgg(self.fig, graph_frame)
+        self.canvas = FigureCanvasTkAgg(self.fig, self.graph_frame)
         self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
         
-        self.cps_data = deque(maxlen=200)
-        self.time_data = deque(maxlen=200)
+        self.figure_backend = (Figure, FigureCanvasTkAgg)
+        self.graph = GraphRenderer(self.fig, self.ax, self.canvas, fps=self.graph.fps)
+        self.graph.set_source(self.core.graph_points)
+        self.graph.start(self.root)
+        self.graph.mark_dirty()
         
     def create_control_panel(self, parent):
         control_frame = tk.Frame(parent, bg='#1a1a1a', relief='raised', bd=3)
@@ -174,8 +293,7 @@ class CPSClickerGame:
                 fg='#00ff00', bg='#1a1a1a').pack(anchor='w', pady=(0, 5))
         
         self.mode_buttons = {}
-        modes = ["Time Trial", "Endless Mode", "Practice Mode"]
-        for mode in modes:
+        for mode in MODES:
             btn = tk.Button(mode_frame, text=mode, 
                            font=('Courier New', 10, 'bold'),
                            bg='#333333', fg='#ffffff',
@@ -194,7 +312,7 @@ class CPSClickerGame:
                 fg='#00ff00', bg='#1a1a1a').pack(anchor='w', pady=(0, 5))
         
         self.time_buttons = {}
-        for time_limit in [5, 10, 15, 30]:
+        for time_limit in TIME_LIMITS:
             btn = tk.Button(time_frame, text=f"{time_limit} Seconds",
                            font=('Courier New', 10, 'bold'),
                            bg='#333333', fg='#ffffff',
@@ -248,209 +366,305 @@ class CPSClickerGame:
                               cursor='hand2')
         export_btn.pack(fill='x', pady=2)
         
+        stats_btn = tk.Button(controls_frame, text="Statistics",
+                             font=('Courier New', 12, 'bold'),
+                             bg='#00ccff', fg='#000000',
+                             activebackground='#0099cc',
+                             relief='raised', bd=3,
+                             command=self.show_statistics,
+                             cursor='hand2')
+        stats_btn.pack(fill='x', pady=2)
+        
+        replay_btn = tk.Button(controls_frame, text="Replay",
+                              font=('Courier New', 12, 'bold'),
+                              bg='#cc66ff', fg='#000000',
+                              activebackground='#9933cc',
+                              relief='raised', bd=3,
+                              command=self.open_replay,
+                              cursor='hand2')
+        replay_btn.pack(fill='x', pady=2)
+        
+        multiplayer_btn = tk.Button(controls_frame, text="Multiplayer",
+                                   font=('Courier New', 12, 'bold'),
+                                   bg='#ffcc00', fg='#000000',
+                                   activebackground='#cc9900',
+                                   relief='raised', bd=3,
+                                   command=self.open_multiplayer,
+                                   cursor='hand2')
+        multiplayer_btn.pack(fill='x', pady=2)
+        
     def update_mode_buttons(self):
         for mode, btn in self.mode_buttons.items():
-            if mode == self.game_mode:
+            if mode == self.core.game_mode:
                 btn.config(bg='#00ff00', fg='#000000')
             else:
                 btn.config(bg='#333333', fg='#ffffff')
     
     def update_time_buttons(self):
         for time_limit, btn in self.time_buttons.items():
-            if time_limit == self.time_limit:
+            if time_limit == self.core.time_limit:
                 btn.config(bg='#00ff00', fg='#000000')
             else:
                 btn.config(bg='#333333', fg='#ffffff')
         
     def set_mode(self, mode):
-        if not self.game_active:
-            self.game_mode = mode
+        if self.core.set_mode(mode):
             self.mode_label.config(text=f"Mode: {mode}")
             self.update_mode_buttons()
             print(f"Game mode set to: {mode}")
         
     def set_time_limit(self, time_limit):
-        if not self.game_active:
-            self.time_limit = time_limit
+        if self.core.set_time_limit(time_limit):
             self.update_time_buttons()
             print(f"Time limit set to: {time_limit} seconds")
         
     def start_game(self):
-        if not self.game_active:
-            self.game_active = True
-            self.clicks = 0
-            self.current_cps = 0
-            self.max_cps = 0
-            self.start_time = time.time()
-            self.click_times.clear()
-            self.cps_data.clear()
-            self.time_data.clear()
-            
+        if self.core.start():
+            self.flag_label.config(text="")
+            self.input_latency.reset()
             self.start_button.config(text="Game Active", state='disabled', bg='#666666')
             self.click_button.config(bg='#00ff00', text="CLICK ME NOW!")
             
-            if self.game_mode == "Time Trial":
-                self.game_timer = threading.Timer(self.time_limit, self.end_game)
-                self.game_timer.start()
+            if self.core.game_mode == "Time Trial":
+                self.game_timer = self.scheduler.call_at(self.core.deadline(), self.end_game)
             
-            print(f"Game started - Mode: {self.game_mode}, Time Limit: {self.time_limit}s")
+            self.request_refresh()
+            print(f"Game started - Mode: {self.core.game_mode}, Time Limit: {self.core.time_limit}s")
     
     def end_game(self):
-        if not self.game_active:
+        if not self.core.game_active:
             return
             
-        self.game_active = False
+        if self.game_timer:
+            self.game_timer.cancel()
+            self.game_timer = None
+        
+        self.process_clicks()
+        if self.replay is not None:
+            self.finish_replay()
+            return
+        session = self.core.end()
+        self.show_verdict(session)
+        self.request_refresh()
         self.start_button.config(text="Start Game", state='normal', bg='#00ff00')
         self.click_button.config(bg='#cccccc', text="GAME OVER")
         
-        if self.clicks > 0:
-            total_time = time.time() - self.start_time
-            final_cps = self.clicks / total_time if total_time > 0 else 0
+        if session:
+            latency = self.input_latency.summary()
+            session['input_latency_p50_ms'] = round(latency['p50_ms'], 2)
+            session['input_latency_p95_ms'] = round(latency['p95_ms'], 2)
+            session['input_latency_p99_ms'] = round(latency['p99_ms'], 2)
+            print(f"Input latency over {latency['samples']} clicks: p50 {latency['p50_ms']:.1f}ms, "
+                  f"p95 {latency['p95_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms")
             
-            session = {
-                'timestamp': datetime.now().isoformat(),
-                'mode': self.game_mode,
-                'time_limit': self.time_limit,
-                'total_clicks': self.clicks,
-                'total_time': total_time,
-                'final_cps': final_cps,
-                'max_cps': self.max_cps
-            }
+            if self.settings['save_timelines']:
+                session['timeline'] = self.save_timeline(session)
             
-            self.session_data.append(session)
-            self.save_session_data()
+            rank = None
+            if self.analytics is not None:
+                rank = self.analytics.percentile_rank(session['mode'], session['time_limit'], session['final_cps'])
+            
+            self.save_session_data(session)
+            if self.leaderboard is not None:
+                self.leaderboard.submit(session)
             
             messagebox.showinfo("Game Complete!", 
                                f"Game Results:\n\n"
-                               f"Total Clicks: {self.clicks}\n"
-                               f"Game Duration: {total_time:.2f} Seconds\n"
-                               f"Final CPS: {final_cps:.2f}\n"
-                               f"Maximum CPS: {self.max_cps:.2f}\n"
-                               f"Average CPS: {final_cps:.2f}")
-        
+                               f"Total Clicks: {session['total_clicks']}\n"
+                               f"Game Duration: {session['total_time']:.2f} Seconds\n"
+                               f"Final CPS: {session['final_cps']:.2f}\n"
+                               f"Maximum CPS: {session['max_cps']:.2f}\n"
+                               f"Average CPS: {session['final_cps']:.2f}"
+                               + (f"\nBetter Than {rank:.0f}% Of Your Previous Games" if rank is not None else "")
+                               + (f"\n\nAuto-Clicker Suspected ({session['autoclick_confidence']:.0%} Confidence)"
+                                  if self.settings['auto_detect'] and session['autoclick_flagged'] else ""))
+        
+        stats = self.graph.stats()
+        print(f"Graph: {stats['frames']} frames ({stats['blits']} blits, {stats['full_draws']} full), "
+              f"draw mean {stats['mean_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms, max {stats['max_ms']:.1f}ms")
+        stats = self.scheduler.stats()
+        print(f"Scheduler: {stats['calls']} timers, late mean {stats['mean_late_ms']:.2f}ms, "
+              f"p95 {stats['p95_late_ms']:.2f}ms, max {stats['max_late_ms']:.2f}ms, "
+              f"overshoot correction {stats['overshoot_ms']:.2f}ms")
         print("Game ended")
     
     def reset_game(self):
-        if hasattr(self, 'game_timer') and self.game_timer:
+        if self.game_timer:
             self.game_timer.cancel()
+            self.game_timer = None
         
-        self.game_active = False
-        self.clicks = 0
-        self.current_cps = 0
-        self.max_cps = 0
-        self.start_time = None
-        self.click_times.clear()
-        self.cps_data.clear()
-        self.time_data.clear()
+        self.pending_clicks.clear()
+        self.stop_replay()
+        self.core.reset()
+        self.flag_label.config(text="")
+        self.request_refresh()
         
         self.start_button.config(text="Start Game", state='normal', bg='#00ff00')
         self.click_button.config(bg='#00ff00', text="CLICK ME!")
         
-        self.ax.clear()
-        self.ax.set_facecolor('#0a0a0a')
-        self.ax.set_xlim(0, 10)
-        self.ax.set_ylim(0, 25)
-        self.ax.set_xlabel('Time (Seconds)', color='white', fontsize=10)
-        self.ax.set_ylabel('Clicks Per Second', color='white', fontsize=10)
-        self.ax.tick_params(colors='white')
-        self.ax.grid(True, alpha=0.3, color='white')
-        self.canvas.draw()
+        self.graph.reset()
         
         print("Game reset")
         
-    def on_click(self):
-        if not self.game_active:
-            messagebox.showinfo("Game Not Started", "Please Click 'Start Game' First!")
+    def on_press(self, event, now=None):
+        if now is None:
+            now = self.core.clock()
+        if self.replay is not None:
             return
-            
-        current_time = time.time()
-        self.clicks += 1
-        self.click_times.append(current_time)
-        
-        if self.settings['sound_enabled']:
-            try:
-                pygame.mixer.Sound.play(pygame.mixer.Sound("click.wav"))
-            except:
-                pass
-        
-        self.calculate_cps()
-        
-        if self.settings['auto_detect'] and self.current_cps > 50:
-            messagebox.showwarning("Auto-Clicker Detection", 
-                                  "Unusually High CPS Detected!\nAre You Using An Auto-Clicker?")
-        
-        print(f"Click registered! Total: {self.clicks}, CPS: {self.current_cps:.1f}")
+        if not self.core.game_active:
+            self.timer_label.config(text="Please Click 'Start Game' First!")
+            return
+        self.input_latency.record(event.time, now * 1000)
+        self.pending_clicks.append(now)
+        if len(self.pending_clicks) == 1:
+            self.root.after_idle(self.process_clicks)
+    
+    def on_key_press(self, event):
+        now = self.core.clock()
+        if self.keys.press(event.keysym, event.time):
+            self.on_press(event, now)
+    
+    def on_key_release(self, event):
+        self.keys.release(event.keysym, event.time)
     
-    def calculate_cps(self):
-        if not self.click_times or not self.start_time:
+    def process_clicks(self):
+        if not self.pending_clicks:
             return
-            
-        current_time = time.time()
-        recent_clicks = [t for t in self.click_times if current_time - t <= 1.0]
+        perf = self.perf
+        perf.begin()
+        clicks, self.pending_clicks = self.pending_clicks, []
+        counted = 0
+        for now in clicks:
+            if self.core.click(now) is not None:
+                counted += 1
+        perf.lap('stats')
+        
+        # One sound per counted click; the channel pool lets a burst overlap
+        # instead of collapsing into a single sound per batch.
+        if self.settings['sound_enabled']:
+            for _ in range(counted):
+                self.audio.play('click')
+        perf.lap('sound')
         
-        self.current_cps = len(recent_clicks)
-        self.max_cps = max(self.max_cps, self.current_cps)
+        self.update_graph()
+        perf.lap('graph')
         
-        elapsed = current_time - self.start_time
-        if elapsed > 0:
-            self.cps_data.append(self.current_cps)
-            self.time_data.append(elapsed)
-            
-            if len(self.cps_data) > 1:
-                self.update_graph()
+        if self.settings['auto_detect'] and not self.flag_label['text'] and self.core.auto_click_suspected():
+            confidence = self.core.detector.confidence if self.core.detector.flagged else 1.0
+            self.flag_label.config(text=f"Auto-Clicker Suspected ({confidence:.0%})")
+        perf.lap('flag')
+    
+    def show_verdict(self, session):
+        # The live label follows the streaming detector, but the saved verdict
+        # comes from analysing the whole game; once it is in, the label shows
+        # that verdict so the two never disagree.
+        if self.settings['auto_detect'] and session and session['autoclick_flagged']:
+            self.flag_label.config(text=f"Auto-Clicker Suspected ({session['autoclick_confidence']:.0%})")
+        else:
+            self.flag_label.config(text="")
     
     def update_graph(self):
-        self.ax.clear()
-        self.ax.set_facecolor('#0a0a0a')
-        
-        if len(self.time_data) > 1 and len(self.cps_data) > 1:
-            self.ax.plot(list(self.time_data), list(self.cps_data), 
-                        color='#00ff00', linewidth=2, marker='o', markersize=1)
+        self.graph.mark_dirty()
+    
+    def toggle_perf(self, event=None):
+        if self.perf.enabled:
+            self.perf.stop()
+            self.perf = NullMonitor()
+            if self.perf_after is not None:
+                self.root.after_cancel(self.perf_after)
+                self.perf_after = None
+            self.perf_label.place_forget()
+        else:
+            self.perf = PerfMonitor(self.root)
+            if self.perf_label is None:
+                self.perf_label = tk.Label(self.root, font=('Courier New', 9), justify='left',
+                                           fg='#00ff00', bg='#000000', anchor='nw')
+            self.perf_label.place(x=8, y=8)
+            self.perf_label.lift()
+            self.refresh_perf()
+        if self.settings['perf_overlay'] != self.perf.enabled:
+            self.settings['perf_overlay'] = self.perf.enabled
+            self.save_settings()
+    
+    def perf_report(self):
+        return self.perf.report(list(self.graph.draw_times), self.scheduler.stats(),
+                                self.input_latency.summary())
+    
+    def refresh_perf(self):
+        self.perf_label.config(text=format_report(self.perf_report()) + "\n[F3] hide  [F4] save")
+        self.perf_after = self.root.after(500, self.refresh_perf)
+    
+    def dump_perf(self, event=None):
+        if not self.perf.enabled:
+            print("Performance overlay is off - press F3 to start collecting")
+            return
+        path = f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.io.submit(path, functools.partial(atomic_write_json, path, self.perf_report(), indent=2))
+        print(f"Performance report saved to {path}")
+    
+    def request_refresh(self):
+        if self.display_after is None:
+            self.display_after = self.root.after_idle(self.update_display)
+    
+    def update_display(self):
+        self.display_after = None
+        now = self.core.clock()
+        
+        self.perf.begin()
+        self.view.update(self.core, now)
+        self.view.flush()
+        self.perf.lap('display')
+        
+        if self.core.game_active:
+            self.update_graph()
+            self.display_after = self.scheduler.call_at(now + next_refresh_delay(self.core, now),
+                                                         self.update_display)
+    
+    def show_statistics(self):
+        if self.analytics is None:
+            messagebox.showinfo("Statistics", "Session History Is Still Loading - Try Again In A Moment.")
+            return
         
-        self.ax.set_xlabel('Time (Seconds)', color='white', fontsize=10)
-        self.ax.set_ylabel('Clicks Per Second', color='white', fontsize=10)
-        self.ax.tick_params(colors='white')
-        self.ax.grid(True, alpha=0.3, color='white')
+        from cps_analytics import group_key, group_label
         
-        if self.time_data:
-            max_time = max(self.time_data)
-            self.ax.set_xlim(0, max(10, max_time + 1))
-        if self.cps_data:
-            max_cps = max(self.cps_data)
-            self.ax.set_ylim(0, max(25, max_cps + 5))
+        stats_window = tk.Toplevel(self.root)
+        stats_window.title("Statistics")
+        stats_window.geometry("560x520")
+        stats_window.configure(bg='#1a1a1a')
         
-        self.canvas.draw()
-    
-    def update_display(self):
-        self.clicks_label.config(text=f"Total Clicks: {self.clicks}")
-        self.cps_label.config(text=f"Current CPS: {self.current_cps:.1f}")
-        self.max_cps_label.config(text=f"Max CPS: {self.max_cps:.1f}")
-        
-        if self.start_time and self.clicks > 0:
-            elapsed = time.time() - self.start_time
-            avg_cps = self.clicks / elapsed if elapsed > 0 else 0
-            self.avg_cps_label.config(text=f"Average CPS: {avg_cps:.1f}")
+        tk.Label(stats_window, text="Statistics",
+                font=('Courier New', 16, 'bold'),
+                fg='#00ff00', bg='#1a1a1a').pack(pady=(20, 10))
+        
+        lines = ["Personal Bests:"]
+        for key, (best, count) in self.analytics.personal_bests().items():
+            lines.append(f"  {group_label(key)}: {best:.2f} CPS ({count} Games)")
+        if len(lines) == 1:
+            lines.append("  No Games Played Yet")
+        
+        mode, time_limit = self.core.game_mode, self.core.time_limit
+        summary = self.analytics.summary(mode, time_limit)
+        lines += ["", f"{group_label(group_key(mode, time_limit))}:"]
+        if summary:
+            trend = summary['trend']
+            lines += [f"  Games Played: {summary['count']}",
+                      f"  Mean CPS: {summary['mean']:.2f}",
+                      f"  Median CPS: {summary['p50']:.2f}",
+                      f"  90th Percentile: {summary['p90']:.2f}",
+                      f"  Last 10 Games Average: {summary['rolling_mean']:.2f}",
+                      f"  Day-Over-Day Change: {trend['day_over_day']:+.2f} CPS",
+                      f"  Trend ({trend['days']} Days): {trend['slope_per_day']:+.3f} CPS/Day"]
         else:
-            self.avg_cps_label.config(text="Average CPS: 0.0")
-        
-        if self.game_active and self.start_time:
-            elapsed = time.time() - self.start_time
-            if self.game_mode == "Time Trial":
-                remaining = max(0, self.time_limit - elapsed)
-                self.timer_label.config(text=f"Time Remaining: {remaining:.1f}s")
-                if remaining <= 0 and self.game_active:
-                    self.end_game()
-            else:
-                self.timer_label.config(text=f"Elapsed Time: {elapsed:.1f}s")
-        elif not self.game_active:
-            self.timer_label.config(text="Game Ready - Click Start!")
+            lines.append("  No Games Played Yet")
         
-        self.root.after(100, self.update_display)
+        tk.Label(stats_window, text="\n".join(lines),
+                font=('Courier New', 12), justify='left',
+                fg='#ffffff', bg='#1a1a1a').pack(padx=20, anchor='w')
     
     def show_settings(self):
         settings_window = tk.Toplevel(self.root)
         settings_window.title("Game Settings")
-        settings_window.geometry("400x300")
+        settings_window.geometry("400x530")
         settings_window.configure(bg='#1a1a1a')
         settings_window.resizable(False, False)
         
@@ -474,9 +688,61 @@ class CPSClickerGame:
                                    variable=auto_detect_var)
         auto_check.pack(pady=10)
         
+        keys_frame = tk.Frame(settings_window, bg='#1a1a1a')
+        keys_frame.pack(pady=10)
+        tk.Label(keys_frame, text="Click Keys:", font=('Courier New', 12),
+                fg='#ffffff', bg='#1a1a1a').pack(side='left', padx=5)
+        keys_var = tk.StringVar(value=', '.join(self.settings['click_keys']))
+        tk.Entry(keys_frame, textvariable=keys_var, width=16,
+                font=('Courier New', 12),
+                fg='#ffffff', bg='#333333',
+                insertbackground='#ffffff').pack(side='left')
+        
+        board_frame = tk.Frame(settings_window, bg='#1a1a1a')
+        board_frame.pack(pady=10)
+        tk.Label(board_frame, text="Leaderboard:", font=('Courier New', 12),
+                fg='#ffffff', bg='#1a1a1a').pack(side='left', padx=5)
+        board_var = tk.StringVar(value=self.settings['leaderboard_address'])
+        tk.Entry(board_frame, textvariable=board_var, width=16,
+                font=('Courier New', 12),
+                fg='#ffffff', bg='#333333',
+                insertbackground='#ffffff').pack(side='left')
+        
+        fps_frame = tk.Frame(settings_window, bg='#1a1a1a')
+        fps_frame.pack(pady=10)
+        tk.Label(fps_frame, text="Graph FPS:", font=('Courier New', 12),
+                fg='#ffffff', bg='#1a1a1a').pack(side='left', padx=5)
+        fps_var = tk.IntVar(value=self.settings['graph_fps'])
+        for fps in (15, 30, 60):
+            tk.Radiobutton(fps_frame, text=str(fps), value=fps,
+                          font=('Courier New', 12),
+                          fg='#ffffff', bg='#1a1a1a',
+                          selectcolor='#333333',
+                          variable=fps_var).pack(side='left')
+        
+        speed_frame = tk.Frame(settings_window, bg='#1a1a1a')
+        speed_frame.pack(pady=10)
+        tk.Label(speed_frame, text="Replay Speed:", font=('Courier New', 12),
+                fg='#ffffff', bg='#1a1a1a').pack(side='left', padx=5)
+        speed_var = tk.IntVar(value=self.settings['replay_speed'])
+        for speed in (1, 2, 4, 10):
+            tk.Radiobutton(speed_frame, text=f"{speed}x", value=speed,
+                          font=('Courier New', 12),
+                          fg='#ffffff', bg='#1a1a1a',
+                          selectcolor='#333333',
+                          variable=speed_var).pack(side='left')
+        
         def save_settings():
             self.settings['sound_enabled'] = sound_var.get()
+            self.settings['replay_speed'] = speed_var.get()
             self.settings['auto_detect'] = auto_detect_var.get()
+            self.settings['graph_fps'] = fps_var.get()
+            self.graph.set_fps(self.settings['graph_fps'])
+            self.settings['click_keys'] = parse_keys(keys_var.get())
+            self.keys.set_keys(self.settings['click_keys'])
+            if board_var.get().strip() != self.settings['leaderboard_address']:
+                self.settings['leaderboard_address'] = board_var.get().strip()
+                self.connect_leaderboard()
             self.save_settings()
             messagebox.showinfo("Settings Saved", "Settings Saved Successfully!")
             settings_window.destroy()
@@ -488,46 +754,199 @@ class CPSClickerGame:
                  command=save_settings).pack(pady=20)
     
     def export_data(self):
-        if not self.session_data:
+        if self.export_job is not None:
+            return
+        if not self.store.count():
             messagebox.showinfo("No Data", "No Session Data Available For Export.")
             return
         
-        filename = f"cps_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        filename = filedialog.asksaveasfilename(
+            title="Export Data", defaultextension='.csv',
+            initialfile=f"cps_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            filetypes=[("CSV", "*.csv"), ("Newline-Delimited JSON", "*.ndjson"), ("NumPy Columns", "*.npz")])
+        if not filename:
+            return
+        include_clicks = messagebox.askyesno("Export Data", "Include Per-Click Timelines Where Available?")
+        
+        from cps_export import ExportJob
+        self.export_job = ExportJob(self.store, filename, include_clicks=include_clicks).start()
+        
+        export_window = tk.Toplevel(self.root)
+        export_window.title("Exporting")
+        export_window.geometry("400x150")
+        export_window.configure(bg='#1a1a1a')
+        export_window.resizable(False, False)
+        
+        status_label = tk.Label(export_window, text="Preparing Export...",
+                               font=('Courier New', 12),
+                               fg='#ffffff', bg='#1a1a1a')
+        status_label.pack(pady=(20, 10))
+        progress = ttk.Progressbar(export_window, length=340, maximum=1.0)
+        progress.pack()
+        
+        job = self.export_job
+        tk.Button(export_window, text="Cancel",
+                 font=('Courier New', 12, 'bold'),
+                 bg='#ff3333', fg='#ffffff',
+                 relief='raised', bd=3,
+                 command=job.cancel).pack(pady=15)
+        export_window.protocol("WM_DELETE_WINDOW", job.cancel)
+        
+        def poll():
+            progress['value'] = job.progress
+            status_label.config(text=f"{job.exported} / {job.total} Sessions")
+            if not job.done.is_set():
+                export_window.after(100, poll)
+                return
+            self.export_job = None
+            export_window.destroy()
+            if job.error is not None:
+                messagebox.showerror("Export Failed", f"Export Failed: {job.error}")
+            elif job.cancelled.is_set():
+                messagebox.showinfo("Export Cancelled", "Export Cancelled - No File Was Written.")
+            else:
+                messagebox.showinfo("Export Complete", "Data Exported To: " + ", ".join(job.outputs))
         
+        poll()
+    
+    def save_session_data(self, session):
+        self.io.append('sessions', self.persist_sessions, session)
+    
+    def persist_sessions(self, sessions):
+        # Runs on the I/O worker, in queue order with load_analytics, so each
+        # session lands in the analytics exactly once.
+        self.store.append_many(sessions)
+        if self.analytics is not None:
+            self.analytics.extend(sessions)
+    
+    def load_analytics(self):
         try:
-            with open(filename, 'w', newline='') as csvfile:
-                fieldnames = ['timestamp', 'mode', 'time_limit', 'total_clicks', 
-                             'total_time', 'final_cps', 'max_cps']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for session in self.session_data:
-                    writer.writerow(session)
-            
-            messagebox.showinfo("Export Complete", f"Data Exported To: {filename}")
-        except Exception as e:
-            messagebox.showerror("Export Failed", f"Export Failed: {str(e)}")
+            from cps_analytics import HistoryAnalytics
+        except ImportError as e:
+            print(f"Statistics unavailable ({e})")
+            return
+        self.analytics = HistoryAnalytics.from_store(self.store)
     
-    def save_session_data(self):
+    def save_timeline(self, session):
+        path = os.path.join('timelines', session['timestamp'].replace(':', '').replace('-', '') + '.cpsr')
+        meta = {field: session[field] for field in META_FIELDS}
+        self.io.submit(path, save_replay, path, self.core.timeline.copy(), meta)
+        return path
+    
+    def open_multiplayer(self):
+        if self.multiplayer is not None:
+            self.multiplayer.window.lift()
+            return
+        if self.core.game_active:
+            messagebox.showinfo("Multiplayer", "Finish The Current Game First.")
+            return
+        self.multiplayer = MultiplayerWindow(self)
+    
+    def open_replay(self):
+        if self.core.game_active:
+            return
+        path = filedialog.askopenfilename(title="Open Replay", initialdir='timelines',
+                                          filetypes=[("CPS Replays", "*.cpsr"), ("All Files", "*.*")])
+        if not path:
+            return
         try:
-            with open('session_data.json', 'w') as f:
-                json.dump(self.session_data, f, indent=2)
-        except Exception as e:
-            print(f"Failed to save session data: {e}")
+            with load_replay(path) as replay:
+                offsets, meta = replay.offsets(), replay.meta
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Replay", f"Could Not Open Replay:\n{e}")
+            return
+        self.start_replay(offsets, meta)
+    
+    def start_replay(self, offsets, meta):
+        self.set_mode(meta.get('mode', "Endless Mode"))
+        if self.core.game_mode == "Time Trial":
+            self.set_time_limit(meta.get('time_limit', self.core.time_limit))
+        
+        # The whole game clock runs faster for an accelerated replay, so the
+        # stats, graph and timers see the original timing unchanged.
+        self.core.clock.set_rate(self.settings['replay_speed'])
+        self.start_game()
+        self.replay = ReplayPlayer(offsets, self.core.start_time, meta.get('total_time'))
+        self.replay_meta = meta
+        self.click_button.config(bg='#cc66ff', text=f"REPLAY {self.settings['replay_speed']}x")
+        if self.core.game_mode != "Time Trial":
+            self.game_timer = self.scheduler.call_at(self.replay.end, self.end_game)
+        self.replay_step()
+    
+    def replay_step(self):
+        self.replay_timer = None
+        if self.replay is None:
+            return
+        self.pending_clicks.extend(self.replay.due(self.core.clock()))
+        self.process_clicks()
+        next_time = self.replay.next_time()
+        if next_time is not None:
+            self.replay_timer = self.scheduler.call_at(next_time, self.replay_step)
+    
+    def stop_replay(self):
+        if self.replay_timer:
+            self.replay_timer.cancel()
+            self.replay_timer = None
+        if self.replay is not None:
+            self.replay = None
+            self.core.clock.set_rate(1.0)
+    
+    def finish_replay(self):
+        # Clicks due exactly at the end may still be waiting on replay_step.
+        end = self.replay.end
+        self.pending_clicks.extend(self.replay.due(end))
+        self.process_clicks()
+        self.stop_replay()
+        session = self.core.end(end)
+        self.show_verdict(session)
+        self.request_refresh()
+        self.start_button.config(text="Start Game", state='normal', bg='#00ff00')
+        self.click_button.config(bg='#cccccc', text="REPLAY OVER")
+        if not session:
+            return
+        
+        meta = self.replay_meta
+        recorded = (f"\n\nRecorded: {meta['total_clicks']} Clicks, {meta['final_cps']:.2f} CPS, "
+                    f"Max {meta['max_cps']:.2f}" if 'final_cps' in meta else "")
+        messagebox.showinfo("Replay Complete",
+                           f"Replay Results:\n\n"
+                           f"Total Clicks: {session['total_clicks']}\n"
+                           f"Game Duration: {session['total_time']:.2f} Seconds\n"
+                           f"Final CPS: {session['final_cps']:.2f}\n"
+                           f"Maximum CPS: {session['max_cps']:.2f}"
+                           + recorded)
     
     def load_session_data(self):
-        try:
-            with open('session_data.json', 'r') as f:
-                self.session_data = json.load(f)
-        except:
-            self.session_data = []
+        self.store = open_store('sessions.db', 'session_data.json')
     
     def run(self):
         self.load_session_data()
+        self.io.submit('analytics', self.load_analytics)
         print("CPS Clicker Game Started!")
         print("Look for the 'Start Game' button in the bottom right section!")
         self.root.mainloop()
+        self.io.close()
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+    
+    def on_close(self):
+        if self.core.game_active:
+            self.end_game()
+        self.root.destroy()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CPS Clicker Game")
+    parser.add_argument('--headless', action='store_true',
+                        help="skip the graph and audio backends (imports neither matplotlib nor pygame)")
+    parser.add_argument('--no-graph', action='store_true', help="disable the real-time graph")
+    parser.add_argument('--no-audio', action='store_true', help="disable sound effects")
+    parser.add_argument('--exit-when-ready', action='store_true',
+                        help="quit as soon as the game is interactive and backends are loaded (startup benchmark)")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    game = CPSClickerGame()
+    args = parse_args()
+    game = CPSClickerGame(graph_enabled=not (args.headless or args.no_graph),
+                          audio_enabled=not (args.headless or args.no_audio),
+                          exit_when_ready=args.exit_when_ready)
     game.run()
@@ -0,0 +1,178 @@
+import threading
+
+import numpy as np
+
+ANALYTICS_FIELDS = ['timestamp', 'mode', 'time_limit', 'final_cps', 'max_cps']
+ROLLING_WINDOW = 10
+TREND_DAYS = 30
+
+
+class Column:
+    def __init__(self, values=(), dtype=np.float64):
+        values = np.asarray(values, dtype=dtype)
+        self.data = np.empty(max(64, 2 * len(values)), dtype=dtype)
+        self.data[:len(values)] = values
+        self.size = len(values)
+
+    def append(self, value):
+        if self.size == len(self.data):
+            grown = np.empty(2 * len(self.data), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self):
+        return self.data[:self.size]
+
+
+def group_key(mode, time_limit):
+    # Only Time Trial games are bounded by the time limit; Endless and
+    # Practice results are comparable whichever limit happened to be selected.
+    return (mode, int(time_limit)) if mode == "Time Trial" else (mode, None)
+
+
+def group_label(key):
+    mode, time_limit = key
+    return f"{mode} / {time_limit}s" if time_limit is not None else mode
+
+
+def to_days(timestamps):
+    return np.array(timestamps, dtype='datetime64[us]').astype('datetime64[D]').astype(np.int64)
+
+
+class GroupStats:
+    def __init__(self, cps, days):
+        self.cps = Column(cps)
+        self.days = Column(days, dtype=np.int64)
+        self.sorted = np.sort(self.cps.view())
+        self.daily = {}
+        if len(days):
+            keys, inverse = np.unique(days, return_inverse=True)
+            counts = np.bincount(inverse)
+            sums = np.bincount(inverse, weights=self.cps.view())
+            bests = np.full(len(keys), -np.inf)
+            np.maximum.at(bests, inverse, self.cps.view())
+            for key, count, total, best in zip(keys.tolist(), counts.tolist(), sums.tolist(), bests.tolist()):
+                self.daily[key] = [count, total, best]
+
+    def add(self, cps, day):
+        self.cps.append(cps)
+        self.days.append(day)
+        self.sorted = np.insert(self.sorted, np.searchsorted(self.sorted, cps), cps)
+        entry = self.daily.get(day)
+        if entry is None:
+            self.daily[day] = [1, cps, cps]
+        else:
+            entry[0] += 1
+            entry[1] += cps
+            entry[2] = max(entry[2], cps)
+
+    @property
+    def count(self):
+        return self.cps.size
+
+    @property
+    def best(self):
+        return float(self.sorted[-1]) if self.count else 0.0
+
+    def percentile(self, p):
+        return float(np.percentile(self.sorted, p)) if self.count else 0.0
+
+    def percentile_rank(self, cps):
+        if not self.count:
+            return 0.0
+        return 100.0 * np.searchsorted(self.sorted, cps, side='right') / self.count
+
+    def rolling_mean(self, window=ROLLING_WINDOW):
+        values = self.cps.view()
+        if len(values) < window:
+            return values.cumsum() / np.arange(1, len(values) + 1)
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        return (csum[window:] - csum[:-window]) / window
+
+    def trend(self, days=TREND_DAYS):
+        if not self.daily:
+            return {'days': 0, 'day_over_day': 0.0, 'slope_per_day': 0.0}
+        keys = np.fromiter(self.daily.keys(), dtype=np.int64, count=len(self.daily))
+        order = np.argsort(keys)[-days:]
+        stats = np.array(list(self.daily.values()), dtype=np.float64)[order]
+        keys = keys[order]
+        means = stats[:, 1] / stats[:, 0]
+        slope = float(np.polyfit(keys - keys[0], means, 1)[0]) if len(keys) > 1 else 0.0
+        return {
+            'days': len(keys),
+            'day_over_day': float(means[-1] - means[-2]) if len(means) > 1 else 0.0,
+            'slope_per_day': slope,
+            'daily_mean': means,
+            'day_keys': keys,
+        }
+
+    def summary(self, window=ROLLING_WINDOW):
+        rolling = self.rolling_mean(window)
+        return {
+            'count': self.count,
+            'best': self.best,
+            'mean': float(self.cps.view().mean()) if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'rolling_mean': float(rolling[-1]) if len(rolling) else 0.0,
+            'trend': self.trend(),
+        }
+
+
+class HistoryAnalytics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.groups = {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        analytics = cls()
+        rows = list(rows)
+        if not rows:
+            return analytics
+        timestamps, modes, limits, cps, _ = zip(*rows)
+        days = to_days(timestamps)
+        cps = np.array(cps, dtype=np.float64)
+        index = {}
+        inverse = np.array([index.setdefault(group_key(mode, limit), len(index))
+                            for mode, limit in zip(modes, limits)])
+        for key, group in index.items():
+            mask = inverse == group
+            analytics.groups[key] = GroupStats(cps[mask], days[mask])
+        return analytics
+
+    @classmethod
+    def from_store(cls, store):
+        return cls.from_rows(store.iter_rows(ANALYTICS_FIELDS, solo=True))
+
+    def extend(self, sessions):
+        # Personal bests and ranks are single-player; hot-seat sessions are
+        # stored but kept out of them.
+        with self.lock:
+            for session in sessions:
+                if 'player' in session:
+                    continue
+                key = group_key(session['mode'], session['time_limit'])
+                day = int(to_days([session['timestamp']])[0])
+                group = self.groups.get(key)
+                if group is None:
+                    self.groups[key] = GroupStats([session['final_cps']], [day])
+                else:
+                    group.add(session['final_cps'], day)
+
+    def summary(self, mode, time_limit):
+        with self.lock:
+            group = self.groups.get(group_key(mode, time_limit))
+            return group.summary() if group else None
+
+    def percentile_rank(self, mode, time_limit, cps):
+        # None when there is nothing to rank against yet.
+        with self.lock:
+            group = self.groups.get(group_key(mode, time_limit))
+            return group.percentile_rank(cps) if group and group.count else None
+
+    def personal_bests(self):
+        with self.lock:
+            return {key: (group.best, group.count) for key, group in sorted(self.groups.items())}
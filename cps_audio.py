@@ -0,0 +1,63 @@
+import os
+
+EFFECTS = {
+    'click': 'click.wav',
+}
+
+
+class NullAudio:
+    available = False
+
+    def play(self, name):
+        pass
+
+    def stop(self):
+        pass
+
+
+class SoundBank:
+    available = True
+
+    def __init__(self, mixer, effects=EFFECTS, channels=8):
+        self.mixer = mixer
+        self.sounds = {}
+        for name, path in effects.items():
+            if not os.path.exists(path):
+                print(f"Sound effect missing: {path}")
+                continue
+            try:
+                self.sounds[name] = mixer.Sound(path)
+            except Exception as e:
+                print(f"Failed to load sound effect {path}: {e}")
+
+        # Reserved channels are never handed out by Sound.play(), so the pool
+        # is ours alone; cycling through it means a new click cuts off the
+        # oldest one instead of waiting for a free channel.
+        mixer.set_num_channels(max(channels, mixer.get_num_channels()))
+        mixer.set_reserved(channels)
+        self.channels = [mixer.Channel(i) for i in range(channels)]
+        self.next_channel = 0
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(self.channels)
+        channel.play(sound)
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+
+
+def create_audio(effects=EFFECTS, channels=8, buffer=512):
+    try:
+        import pygame
+        # A small mixer buffer keeps click-to-sound latency low.
+        pygame.mixer.pre_init(44100, -16, 2, buffer)
+        pygame.mixer.init()
+    except Exception as e:
+        print(f"Audio initialization failed - continuing without sound ({e})")
+        return NullAudio()
+    return SoundBank(pygame.mixer, effects, channels)
@@ -0,0 +1,100 @@
+import math
+import time
+from collections import deque
+
+
+class GameClock:
+    def __init__(self, source=time.perf_counter_ns):
+        self.source = source
+        self.epoch_ns = source()
+        self.base_ns = 0
+        self.rate = 1.0
+
+    def now_ns(self):
+        if self.rate == 1.0:
+            return self.base_ns + self.source() - self.epoch_ns
+        return self.base_ns + int((self.source() - self.epoch_ns) * self.rate)
+
+    def now(self):
+        return self.now_ns() / 1e9
+
+    def set_rate(self, rate):
+        # Rebase at the current reading so game time stays continuous and
+        # monotonic; replays use this to run the whole game faster.
+        now_ns = self.now_ns()
+        self.base_ns = now_ns
+        self.epoch_ns = self.source()
+        self.rate = rate
+
+    def __call__(self):
+        return self.now()
+
+
+class ScheduledCall:
+    def __init__(self, scheduler, when, callback):
+        self.scheduler = scheduler
+        self.when = when
+        self.callback = callback
+        self.after_id = None
+        self.requested = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.after_id is not None:
+            self.scheduler.root.after_cancel(self.after_id)
+            self.after_id = None
+
+
+class LoopScheduler:
+    def __init__(self, root, clock, smoothing=0.2):
+        self.root = root
+        self.clock = clock
+        self.smoothing = smoothing
+        self.overshoot = 0.0
+        self.lateness = deque(maxlen=500)
+
+    def call_at(self, when, callback):
+        call = ScheduledCall(self, when, callback)
+        self.arm(call)
+        return call
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.clock() + delay, callback)
+
+    def arm(self, call):
+        # Tk's after() usually fires a little late; aim early by the measured
+        # overshoot and finish the last millisecond or so in fire().
+        rate = getattr(self.clock, 'rate', 1.0)
+        remaining = call.when - self.clock() - self.overshoot
+        delay_ms = max(0, math.floor(remaining / rate * 1000))
+        call.requested = self.clock() + delay_ms / 1000 * rate
+        call.after_id = self.root.after(delay_ms, lambda: self.fire(call))
+
+    def fire(self, call):
+        call.after_id = None
+        if call.cancelled:
+            return
+        now = self.clock()
+        if call.requested is not None:
+            error = now - call.requested
+            self.overshoot += self.smoothing * (max(0.0, error) - self.overshoot)
+            call.requested = None
+        if now < call.when:
+            self.arm(call)
+            return
+        self.lateness.append(now - call.when)
+        call.callback()
+
+    def stats(self):
+        values = sorted(self.lateness)
+        if not values:
+            return {'calls': 0, 'overshoot_ms': self.overshoot * 1000,
+                    'mean_late_ms': 0.0, 'p95_late_ms': 0.0, 'max_late_ms': 0.0}
+        return {
+            'calls': len(values),
+            'overshoot_ms': self.overshoot * 1000,
+            'mean_late_ms': sum(values) / len(values) * 1000,
+            'p95_late_ms': values[min(len(values) - 1, int(len(values) * 0.95))] * 1000,
+            'max_late_ms': values[-1] * 1000,
+        }
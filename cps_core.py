@@ -0,0 +1,265 @@
+import itertools
+from datetime import datetime
+
+from cps_clock import GameClock
+from cps_detect import StreamingDetector, analyze
+from cps_engine import RateEngine
+from cps_series import ClickSeries
+from cps_timeline import ClickTimeline
+
+MODES = ["Time Trial", "Endless Mode", "Practice Mode"]
+TIME_LIMITS = [5, 10, 15, 30]
+AUTO_CLICK_CPS = 50
+MAX_PLAYERS = 8
+
+
+class GameCore:
+    def __init__(self, mode="Time Trial", time_limit=10, clock=None):
+        self.clock = clock if clock is not None else GameClock()
+        self.game_mode = mode
+        self.time_limit = time_limit
+        self.rate = RateEngine()
+        self.timeline = ClickTimeline()
+        self.detector = StreamingDetector()
+        self.series = ClickSeries()
+        self.reset()
+
+    def reset(self):
+        self.game_active = False
+        self.clicks = 0
+        self.current_cps = 0
+        self.max_cps = 0
+        self.start_time = None
+        self.timeline.reset()
+        self.rate.reset()
+        self.detector.reset()
+        self.series.clear()
+
+    def set_mode(self, mode):
+        if self.game_active or mode not in MODES:
+            return False
+        self.game_mode = mode
+        return True
+
+    def set_time_limit(self, time_limit):
+        if self.game_active:
+            return False
+        self.time_limit = time_limit
+        return True
+
+    def start(self, now=None):
+        if self.game_active:
+            return False
+        self.reset()
+        self.game_active = True
+        self.start_time = self.clock() if now is None else now
+        self.timeline.reset(self.start_time)
+        self.rate.reset(self.start_time)
+        return True
+
+    def click(self, now=None):
+        if not self.game_active:
+            return None
+        if now is None:
+            now = self.clock()
+        deadline = self.deadline()
+        if deadline is not None and now > deadline:
+            return None
+        self.clicks += 1
+        self.timeline.append(now)
+        self.rate.record(now)
+        self.detector.update(now)
+        self.series.add(now - self.start_time)
+        self.calculate_cps(now)
+        return self.current_cps
+
+    def calculate_cps(self, now=None):
+        if not self.rate.total or self.start_time is None:
+            return
+        if now is None:
+            now = self.clock()
+
+        self.current_cps = self.rate.cps(now)
+        self.max_cps = self.rate.max_cps
+
+    def graph_points(self, max_points=None, now=None):
+        if self.start_time is None:
+            return [], []
+        until = self.elapsed(now) if self.game_active else self.series.last
+        deadline = self.deadline()
+        if deadline is not None:
+            until = min(until, self.time_limit)
+        return self.series.points(until, max_points)
+
+    def auto_click_suspected(self):
+        return self.detector.flagged or self.current_cps > AUTO_CLICK_CPS
+
+    def detection(self):
+        try:
+            result = analyze(self.timeline.to_numpy())
+        except ImportError:
+            result = self.detector.stats()
+        if self.max_cps > AUTO_CLICK_CPS:
+            result['confidence'] = 1.0
+            result['flagged'] = True
+        return result
+
+    def elapsed(self, now=None):
+        if self.start_time is None:
+            return 0.0
+        return (self.clock() if now is None else now) - self.start_time
+
+    def deadline(self):
+        if self.game_mode != "Time Trial" or self.start_time is None:
+            return None
+        return self.start_time + self.time_limit
+
+    def remaining(self, now=None):
+        if self.game_mode != "Time Trial":
+            return None
+        return max(0, self.time_limit - self.elapsed(now))
+
+    def expired(self, now=None):
+        return self.game_active and self.game_mode == "Time Trial" and self.remaining(now) <= 0
+
+    def smoothed_cps(self, now=None):
+        if not self.game_active:
+            return self.current_cps
+        return self.rate.smoothed_cps(self.clock() if now is None else now)
+
+    def average_cps(self, now=None):
+        if self.start_time is None or not self.clicks:
+            return 0.0
+        return self.rate.average_cps(self.clock() if now is None else now)
+
+    def end(self, now=None):
+        if not self.game_active:
+            return None
+        self.game_active = False
+        if self.clicks == 0:
+            return None
+
+        if now is None:
+            now = self.clock()
+        deadline = self.deadline()
+        if deadline is not None:
+            now = min(now, deadline)
+        total_time = now - self.start_time
+        final_cps = self.clicks / total_time if total_time > 0 else 0
+        detection = self.detection()
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'mode': self.game_mode,
+            'time_limit': self.time_limit,
+            'total_clicks': self.clicks,
+            'total_time': total_time,
+            'final_cps': final_cps,
+            'max_cps': self.max_cps,
+            'autoclick_confidence': round(detection['confidence'], 3),
+            'autoclick_flagged': detection['flagged']
+        }
+
+
+class MultiplayerCore:
+    def __init__(self, names, mode="Time Trial", time_limit=10, clock=None):
+        if not 1 <= len(names) <= MAX_PLAYERS:
+            raise ValueError(f"between 1 and {MAX_PLAYERS} players are supported")
+        self.clock = clock if clock is not None else GameClock()
+        self.names = list(names)
+        # Every player gets a complete GameCore of their own; only the clock
+        # and the start time are shared, so a click touches one player's
+        # state and costs the same however many others are playing.
+        self.players = [GameCore(mode, time_limit, self.clock) for _ in self.names]
+
+    def __len__(self):
+        return len(self.players)
+
+    @property
+    def leader(self):
+        return self.players[0]
+
+    @property
+    def game_active(self):
+        return self.leader.game_active
+
+    @property
+    def game_mode(self):
+        return self.leader.game_mode
+
+    @property
+    def time_limit(self):
+        return self.leader.time_limit
+
+    def reset(self):
+        for player in self.players:
+            player.reset()
+
+    def set_mode(self, mode):
+        return all([player.set_mode(mode) for player in self.players])
+
+    def set_time_limit(self, time_limit):
+        return all([player.set_time_limit(time_limit) for player in self.players])
+
+    def start(self, now=None):
+        if self.game_active:
+            return False
+        if now is None:
+            now = self.clock()
+        for player in self.players:
+            player.start(now)
+        return True
+
+    def click(self, index, now=None):
+        return self.players[index].click(now)
+
+    def elapsed(self, now=None):
+        return self.leader.elapsed(now)
+
+    def deadline(self):
+        return self.leader.deadline()
+
+    def remaining(self, now=None):
+        return self.leader.remaining(now)
+
+    def expired(self, now=None):
+        return self.leader.expired(now)
+
+    def end(self, now=None):
+        if not self.game_active:
+            return []
+        if now is None:
+            now = self.clock()
+        sessions = []
+        for name, player in zip(self.names, self.players):
+            session = player.end(now)
+            if session is not None:
+                session['player'] = name
+                sessions.append(session)
+        sessions.sort(key=lambda session: session['final_cps'], reverse=True)
+        return sessions
+
+
+class ScriptedDriver:
+    def __init__(self, core, on_click=None):
+        self.core = core
+        self.on_click = on_click
+
+    def run(self, timestamps, start=None, end=None):
+        # start and end default to the first and last click; recorded games
+        # pass their real start (0.0 for replay offsets) and total time.
+        timestamps = iter(timestamps)
+        first = next(timestamps, None)
+        if first is None:
+            return None
+        self.core.start(first if start is None else start)
+
+        last = first
+        for t in itertools.chain([first], timestamps):
+            last = t
+            if self.core.expired(t):
+                break
+            self.core.click(t)
+            if self.on_click is not None:
+                self.on_click(t)
+        return self.core.end(last if end is None else end)
@@ -0,0 +1,170 @@
+import math
+
+MIN_INTERVALS = 20
+BIN_WIDTH = 0.002
+FLAG_CONFIDENCE = 0.6
+MIN_HUMAN_INTERVAL = 0.02
+WINDOW = 50
+
+
+def clamp(x, lo=0.0, hi=1.0):
+    return lo if x < lo else hi if x > hi else x
+
+
+def score(cv, entropy, periodicity, mean_interval):
+    # Humans rarely hold a coefficient of variation under ~0.1 or spread
+    # their intervals over fewer than a handful of 2 ms bins; a fixed-period
+    # clicker does both. Sub-20 ms mean intervals are simply not human.
+    if mean_interval and mean_interval < MIN_HUMAN_INTERVAL:
+        return 1.0
+    cv_score = clamp((0.10 - cv) / 0.08)
+    entropy_score = clamp((3.0 - entropy) / 2.0)
+    periodicity_score = clamp((abs(periodicity) - 0.5) / 0.4)
+    return clamp(0.6 * cv_score + 0.3 * entropy_score + 0.1 * periodicity_score)
+
+
+class StreamingDetector:
+    def __init__(self, min_intervals=MIN_INTERVALS, bin_width=BIN_WIDTH, threshold=FLAG_CONFIDENCE):
+        self.min_intervals = min_intervals
+        self.bin_width = bin_width
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        self.last_time = None
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.bins = {}
+        self.bin_entropy_sum = 0.0
+        self.prev = None
+        self.prev2 = None
+        self.lag_sums = [0.0, 0.0]
+        self.lag_counts = [0, 0]
+        self.confidence = 0.0
+        self.flagged = False
+
+    def update(self, t):
+        if self.last_time is None:
+            self.last_time = t
+            return self.confidence
+        interval = t - self.last_time
+        self.last_time = t
+
+        self.n += 1
+        delta = interval - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (interval - self.mean)
+
+        # Keep sum(c * log c) over histogram bins so entropy is O(1) to update.
+        key = int(interval / self.bin_width)
+        c = self.bins.get(key, 0)
+        self.bins[key] = c + 1
+        self.bin_entropy_sum += (c + 1) * math.log(c + 1) - (c * math.log(c) if c else 0.0)
+
+        if self.prev is not None:
+            self.lag_sums[0] += interval * self.prev
+            self.lag_counts[0] += 1
+        if self.prev2 is not None:
+            self.lag_sums[1] += interval * self.prev2
+            self.lag_counts[1] += 1
+        self.prev2 = self.prev
+        self.prev = interval
+
+        if self.n >= self.min_intervals:
+            self.confidence = score(self.cv(), self.entropy(), self.periodicity(), self.mean)
+            if self.confidence >= self.threshold:
+                self.flagged = True
+        return self.confidence
+
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def cv(self):
+        return math.sqrt(self.variance()) / self.mean if self.mean > 0 else 0.0
+
+    def entropy(self):
+        if not self.n:
+            return 0.0
+        return (math.log(self.n) - self.bin_entropy_sum / self.n) / math.log(2)
+
+    def periodicity(self):
+        variance = self.variance()
+        if variance <= 0:
+            return 0.0
+        best = 0.0
+        for lag_sum, count in zip(self.lag_sums, self.lag_counts):
+            if count:
+                r = (lag_sum / count - self.mean * self.mean) / variance
+                if abs(r) > abs(best):
+                    best = r
+        return clamp(best, -1.0, 1.0)
+
+    def stats(self):
+        return {
+            'intervals': self.n,
+            'mean_interval': self.mean,
+            'cv': self.cv(),
+            'entropy': self.entropy(),
+            'periodicity': self.periodicity(),
+            'confidence': self.confidence,
+            'flagged': self.flagged,
+        }
+
+
+def analyze(timestamps, bin_width=BIN_WIDTH, window=WINDOW, threshold=FLAG_CONFIDENCE):
+    import numpy as np
+
+    times = np.asarray(timestamps, dtype=np.float64)
+    intervals = np.diff(times)
+    n = len(intervals)
+    result = {'intervals': n, 'confidence': 0.0, 'flagged': False}
+    if n < MIN_INTERVALS:
+        return result
+
+    mean = intervals.mean()
+    std = intervals.std(ddof=1)
+    cv = std / mean if mean > 0 else 0.0
+
+    _, counts = np.unique((intervals / bin_width).astype(np.int64), return_counts=True)
+    p = counts / n
+    entropy = float(-(p * np.log2(p)).sum())
+
+    centered = intervals - mean
+    denom = (centered * centered).sum()
+    periodicity = 0.0
+    if denom > 0:
+        for lag in range(1, min(8, n // 4) + 1):
+            r = float((centered[lag:] * centered[:-lag]).sum() / denom)
+            if abs(r) > abs(periodicity):
+                periodicity = r
+
+    # Rolling CV over fixed-size windows catches an auto-clicker switched on
+    # for part of a session, which the whole-session numbers dilute.
+    window_cv = cv
+    window_entropy = entropy
+    if n >= 2 * window:
+        csum = np.concatenate(([0.0], np.cumsum(intervals)))
+        csum2 = np.concatenate(([0.0], np.cumsum(intervals * intervals)))
+        w_mean = (csum[window:] - csum[:-window]) / window
+        w_var = np.maximum((csum2[window:] - csum2[:-window]) / window - w_mean * w_mean, 0.0)
+        w_cv = np.sqrt(w_var * window / (window - 1)) / np.where(w_mean > 0, w_mean, np.inf)
+        worst = int(np.argmin(w_cv))
+        window_cv = float(w_cv[worst])
+        _, w_counts = np.unique((intervals[worst:worst + window] / bin_width).astype(np.int64),
+                                return_counts=True)
+        w_p = w_counts / window
+        window_entropy = float(-(w_p * np.log2(w_p)).sum())
+
+    confidence = float(max(score(cv, entropy, periodicity, mean),
+                           score(window_cv, window_entropy, 0.0, mean)))
+    result.update({
+        'mean_interval': float(mean),
+        'cv': float(cv),
+        'entropy': entropy,
+        'periodicity': periodicity,
+        'min_window_cv': window_cv,
+        'confidence': confidence,
+        'flagged': confidence >= threshold,
+    })
+    return result
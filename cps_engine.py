@@ -0,0 +1,83 @@
+import math
+import time
+from collections import deque
+
+
+class RateWindow:
+    def __init__(self, span):
+        self.span = span
+        self.times = deque()
+
+    def push(self, t):
+        self.times.append(t)
+        self.evict(t)
+
+    def evict(self, now):
+        cutoff = now - self.span
+        times = self.times
+        while times and times[0] < cutoff:
+            times.popleft()
+
+    def count(self, now=None):
+        if now is not None:
+            self.evict(now)
+        return len(self.times)
+
+    def clear(self):
+        self.times.clear()
+
+
+class RateEngine:
+    def __init__(self, window=1.0, smoothing=0.5):
+        self.window = RateWindow(window)
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self, start_time=None):
+        self.window.clear()
+        self.start_time = start_time
+        self.total = 0
+        self.last_time = None
+        self.smoothed = 0.0
+        self.max_cps = 0
+
+    def record(self, t=None):
+        if t is None:
+            t = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = t
+
+        self.window.push(t)
+
+        if self.last_time is not None:
+            dt = t - self.last_time
+            if dt > 0:
+                alpha = 1.0 - math.exp(-dt / self.smoothing)
+                self.smoothed += alpha * (1.0 / dt - self.smoothed)
+        self.last_time = t
+        self.total += 1
+
+        current = len(self.window.times)
+        if current > self.max_cps:
+            self.max_cps = current
+        return current
+
+    def cps(self, now=None):
+        return self.window.count(now)
+
+    def smoothed_cps(self, now=None):
+        if self.last_time is None:
+            return 0.0
+        if now is None or now <= self.last_time:
+            return self.smoothed
+        # No click since last_time: decay toward zero as the gap grows.
+        gap = now - self.last_time
+        return min(self.smoothed, 1.0 / gap) if gap > 0 else self.smoothed
+
+    def average_cps(self, now=None):
+        if self.start_time is None or self.total == 0:
+            return 0.0
+        if now is None:
+            now = time.perf_counter()
+        elapsed = now - self.start_time
+        return self.total / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,310 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from cps_core import AUTO_CLICK_CPS, GameCore, MODES, ScriptedDriver, TIME_LIMITS
+from cps_detect import FLAG_CONFIDENCE, analyze
+from cps_synth import click_array
+
+EVAL_FIELDS = ['id', 'source', 'label', 'mode', 'time_limit', 'total_clicks', 'total_time',
+               'final_cps', 'max_cps', 'confidence', 'flagged', 'stream_flagged', 'rate_flagged']
+KINDS = ['human', 'bot', 'hybrid']
+CHUNK = 500
+CONFIDENCE_BINS = 100
+CPS_THRESHOLDS = [15, 20, 25, 30, 40, 50, 75, 100]
+
+_core = None
+
+
+def synthetic_session(index, seed=0):
+    # Each session is a pure function of (seed, index), so workers generate
+    # their own streams and runs are reproducible regardless of scheduling.
+    rng = np.random.default_rng([seed, index])
+    kind = KINDS[rng.integers(3)] if rng.random() < 0.5 else 'human'
+    mode = MODES[rng.integers(len(MODES))]
+    time_limit = TIME_LIMITS[rng.integers(len(TIME_LIMITS))]
+    duration = time_limit if mode == "Time Trial" else rng.uniform(5, 30)
+
+    if kind == 'human':
+        timestamps = click_array(rng.uniform(4, 14), duration, rng.uniform(0.15, 0.45), rng=rng)
+    elif kind == 'bot':
+        timestamps = click_array(rng.uniform(8, 80), duration, rng.uniform(0.0, 0.03), rng=rng)
+    else:
+        # A human who switches an auto-clicker on part-way through.
+        switch = duration * rng.uniform(0.3, 0.7)
+        human = click_array(rng.uniform(4, 14), switch, rng.uniform(0.15, 0.45), rng=rng)
+        start = human[-1] + 0.1 if len(human) else 0.0
+        bot = click_array(rng.uniform(10, 40), duration - start, rng.uniform(0.0, 0.03), start, rng)
+        timestamps = np.concatenate((human, bot))
+    return {'id': f"synthetic-{seed}-{index}", 'source': kind, 'label': 0 if kind == 'human' else 1,
+            'mode': mode, 'time_limit': time_limit}, timestamps
+
+
+def make_row(info, session, stream_flagged=None):
+    return {
+        'id': info['id'],
+        'source': info['source'],
+        'label': info['label'],
+        'mode': info['mode'],
+        'time_limit': info['time_limit'],
+        'total_clicks': session['total_clicks'],
+        'total_time': round(session['total_time'], 6),
+        'final_cps': round(session['final_cps'], 4),
+        'max_cps': session['max_cps'],
+        'confidence': session['autoclick_confidence'],
+        'flagged': bool(session['autoclick_flagged']),
+        'stream_flagged': stream_flagged,
+        'rate_flagged': session['max_cps'] > AUTO_CLICK_CPS,
+    }
+
+
+def score_exact(info, timestamps):
+    global _core
+    if _core is None:
+        _core = GameCore()
+    # One core per worker; start() inside the driver resets it between sessions.
+    _core.set_mode(info['mode'])
+    _core.set_time_limit(info['time_limit'])
+    session = ScriptedDriver(_core).run(timestamps.tolist(), info.get('start'), info.get('end'))
+    if session is None:
+        return None
+    return make_row(info, session, _core.detector.flagged)
+
+
+def score_fast(info, timestamps):
+    # Array form of ScriptedDriver + GameCore.end: the same cut-off at the
+    # deadline, the same 1 s window for max CPS and the same analyze() call,
+    # without stepping through every click.  The live detector is skipped.
+    if not len(timestamps):
+        return None
+    start = timestamps[0] if info.get('start') is None else info['start']
+    end = timestamps[-1] if info.get('end') is None else info['end']
+    if info['mode'] == "Time Trial":
+        deadline = start + info['time_limit']
+        cut = int(np.searchsorted(timestamps - start >= info['time_limit'], True))
+        if cut < len(timestamps):
+            if info.get('end') is None:
+                end = timestamps[cut]
+            timestamps = timestamps[:cut]
+        end = min(end, deadline)
+    clicks = len(timestamps)
+    in_window = np.arange(1, clicks + 1) - np.searchsorted(timestamps, timestamps - 1.0, side='left')
+    max_cps = int(in_window.max())
+    total_time = end - start
+
+    detection = analyze(timestamps - start)
+    if max_cps > AUTO_CLICK_CPS:
+        detection['confidence'] = 1.0
+        detection['flagged'] = True
+    return make_row(info, {
+        'total_clicks': clicks,
+        'total_time': total_time,
+        'final_cps': clicks / total_time if total_time > 0 else 0,
+        'max_cps': max_cps,
+        'autoclick_confidence': round(detection['confidence'], 3),
+        'autoclick_flagged': detection['flagged'],
+    })
+
+
+SCORERS = {'fast': score_fast, 'exact': score_exact}
+
+
+def run_synthetic(task):
+    start, stop, seed, scorer = task
+    score = SCORERS[scorer]
+    rows = []
+    for index in range(start, stop):
+        row = score(*synthetic_session(index, seed))
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def run_replays(task):
+    from cps_replay import load_replay
+    paths, label, scorer = task
+    score = SCORERS[scorer]
+    rows = []
+    for path in paths:
+        try:
+            with load_replay(path) as replay:
+                offsets, meta = np.asarray(replay.offsets(), dtype=np.float64), replay.meta
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        # Offsets count from the start of the game, not the first click, and
+        # the game may have run on after the last click.
+        info = {'id': os.path.basename(path), 'source': 'replay', 'label': label,
+                'mode': meta.get('mode', "Endless Mode"), 'time_limit': meta.get('time_limit', 10),
+                'start': 0.0, 'end': meta.get('total_time')}
+        row = score(info, offsets)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+class Tally:
+    def __init__(self, bins=CONFIDENCE_BINS, cps_thresholds=CPS_THRESHOLDS):
+        self.bins = bins
+        self.cps_thresholds = cps_thresholds
+        # Histograms per label keep the threshold sweep O(bins) in memory no
+        # matter how many sessions stream past.
+        self.confidence = {0: [0] * (bins + 1), 1: [0] * (bins + 1)}
+        self.max_cps = {0: [0] * len(cps_thresholds), 1: [0] * len(cps_thresholds)}
+        self.counts = {0: 0, 1: 0}
+        self.rule = {key: {0: 0, 1: 0} for key in ('flagged', 'stream_flagged', 'rate_flagged')}
+        self.sessions = 0
+
+    def add(self, row):
+        self.sessions += 1
+        label = row['label']
+        if label not in self.counts:
+            return
+        self.counts[label] += 1
+        self.confidence[label][min(self.bins, int(row['confidence'] * self.bins))] += 1
+        for i, threshold in enumerate(self.cps_thresholds):
+            if row['max_cps'] > threshold:
+                self.max_cps[label][i] += 1
+        for key, counts in self.rule.items():
+            if row[key]:
+                counts[label] += 1
+        if row['stream_flagged'] is None:
+            self.rule.pop('stream_flagged', None)
+
+    def rates(self, positives_human, positives_bot):
+        humans, bots = self.counts[0], self.counts[1]
+        fp = positives_human / humans if humans else 0.0
+        fn = (bots - positives_bot) / bots if bots else 0.0
+        return fp, fn
+
+    def confidence_sweep(self, thresholds):
+        rows = []
+        for threshold in thresholds:
+            start = int(round(threshold * self.bins))
+            rows.append((threshold,) + self.rates(sum(self.confidence[0][start:]), sum(self.confidence[1][start:])))
+        return rows
+
+    def cps_sweep(self):
+        return [(threshold,) + self.rates(self.max_cps[0][i], self.max_cps[1][i])
+                for i, threshold in enumerate(self.cps_thresholds)]
+
+    def report(self):
+        lines = [f"{self.sessions} sessions ({self.counts[0]} human, {self.counts[1]} auto-clicker)"]
+        if not (self.counts[0] or self.counts[1]):
+            return '\n'.join(lines)
+        lines.append(f"{'rule':<34} {'false pos':>10} {'false neg':>10}")
+        names = {
+            'flagged': f"game verdict (confidence >= {FLAG_CONFIDENCE})",
+            'stream_flagged': "live detector",
+            'rate_flagged': f"max CPS > {AUTO_CLICK_CPS}",
+        }
+        for key, counts in self.rule.items():
+            fp, fn = self.rates(counts[0], counts[1])
+            lines.append(f"{names[key]:<34} {fp:>10.2%} {fn:>10.2%}")
+        lines.append("")
+        lines.append(f"{'confidence >=':<34} {'false pos':>10} {'false neg':>10}")
+        for threshold, fp, fn in self.confidence_sweep([0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]):
+            lines.append(f"{threshold:<34.2f} {fp:>10.2%} {fn:>10.2%}")
+        lines.append("")
+        lines.append(f"{'max CPS >':<34} {'false pos':>10} {'false neg':>10}")
+        for threshold, fp, fn in self.cps_sweep():
+            lines.append(f"{threshold:<34} {fp:>10.2%} {fn:>10.2%}")
+        return '\n'.join(lines)
+
+
+class ResultWriter:
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, 'w', newline='') if path else None
+        self.ndjson = bool(path) and path.endswith(('.ndjson', '.jsonl'))
+        self.writer = None
+        if self.f is not None and not self.ndjson:
+            self.writer = csv.DictWriter(self.f, fieldnames=EVAL_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, rows):
+        if self.f is None:
+            return
+        if self.ndjson:
+            self.f.writelines(json.dumps(row) + '\n' for row in rows)
+        else:
+            self.writer.writerows(rows)
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+
+
+def synthetic_tasks(count, seed, scorer, chunk=CHUNK):
+    return [(start, min(count, start + chunk), seed, scorer) for start in range(0, count, chunk)]
+
+
+def replay_tasks(paths, label, scorer, chunk=CHUNK // 10):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.cpsr'))))
+        else:
+            files.append(path)
+    return [(files[i:i + chunk], label, scorer) for i in range(0, len(files), chunk)]
+
+
+def dispatch(job):
+    func, task = job
+    return func(task)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-evaluate scoring and auto-clicker detection")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='N', help="generate N labelled synthetic sessions")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--replays', nargs='*', default=[], help="replay files or directories to score")
+    parser.add_argument('--replay-label', choices=['human', 'bot', 'unknown'], default='unknown',
+                        help="ground truth for --replays (unknown sessions are scored but not counted in error rates)")
+    parser.add_argument('--output', default='eval_results.csv', help="per-session results (.csv or .ndjson); '' to skip")
+    parser.add_argument('--exact', action='store_true',
+                        help="step every click through GameCore (also reports the live detector; much slower)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if not args.synthetic and not args.replays:
+        parser.error("nothing to evaluate - pass --synthetic N and/or --replays PATH")
+
+    label = {'human': 0, 'bot': 1}.get(args.replay_label)
+    scorer = 'exact' if args.exact else 'fast'
+    jobs = [(run_synthetic, task) for task in synthetic_tasks(args.synthetic, args.seed, scorer)]
+    jobs += [(run_replays, task) for task in replay_tasks(args.replays, label, scorer)]
+
+    tally = Tally()
+    writer = ResultWriter(args.output)
+    started = time.perf_counter()
+    last_report = started
+    try:
+        with Pool(args.workers) as pool:
+            for rows in pool.imap_unordered(dispatch, jobs):
+                writer.write(rows)
+                for row in rows:
+                    tally.add(row)
+                now = time.perf_counter()
+                if now - last_report >= 5:
+                    last_report = now
+                    print(f"  {tally.sessions} sessions, {tally.sessions / (now - started):.0f}/s")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Evaluated in {elapsed:.1f}s ({tally.sessions / max(elapsed, 1e-9):.0f} sessions/s "
+          f"on {args.workers} workers)")
+    print(tally.report())
+    if args.output:
+        print(f"Per-session results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
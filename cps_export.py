@@ -0,0 +1,244 @@
+import argparse
+import csv
+import io
+import json
+import os
+import threading
+import zipfile
+from itertools import islice
+
+from cps_io import atomic_write
+from cps_store import SESSION_FIELDS
+
+CHUNK_SIZE = 1000
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.npz': 'npz'}
+EXTRA_FIELDS = ['player', 'autoclick_confidence', 'autoclick_flagged', 'input_latency_p50_ms',
+                'input_latency_p95_ms', 'input_latency_p99_ms', 'timeline']
+EXPORT_FIELDS = ['session'] + SESSION_FIELDS + EXTRA_FIELDS
+TEXT_FIELDS = {'timestamp', 'mode', 'player', 'timeline'}
+CLICK_FIELDS = ['session', 'click', 'offset']
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def format_for(path):
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def clicks_path(path):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_clicks{ext}"
+
+
+def load_clicks(session):
+    path = session.get('timeline')
+    if not path or not os.path.exists(path):
+        return None
+    from cps_replay import load_replay
+    try:
+        with load_replay(path) as replay:
+            offsets = replay.offsets()
+    except (OSError, ValueError) as e:
+        print(f"Skipping clicks for {path}: {e}")
+        return None
+    # Offsets are whole ticks; rounding to the nanosecond drops float noise
+    # from the tick scaling so text exports stay short.
+    if hasattr(offsets, 'round'):
+        return offsets.round(9).tolist()
+    return [round(t, 9) for t in offsets]
+
+
+def write_array(archive, name, array):
+    import numpy as np
+    with archive.open(name + '.npy', 'w', force_zip64=True) as out:
+        np.lib.format.write_array(out, array, allow_pickle=False)
+
+
+def load_npz(path):
+    # Columns are stored as numbered chunks (final_cps_00000, ...); stitch
+    # them back together into one array per column.
+    import numpy as np
+    columns = {}
+    with np.load(path) as data:
+        for name in sorted(data.files):
+            columns.setdefault(name.rsplit('_', 1)[0], []).append(data[name])
+    return {column: np.concatenate(parts) for column, parts in columns.items()}
+
+
+class ExportJob:
+    def __init__(self, store, path, fmt=None, include_clicks=False, chunk_size=CHUNK_SIZE):
+        self.store = store
+        self.path = path
+        self.fmt = fmt or format_for(path)
+        if self.fmt not in FORMATS.values():
+            raise ValueError(f"unknown export format: {self.fmt}")
+        self.include_clicks = include_clicks
+        self.chunk_size = chunk_size
+        self.total = 0
+        self.exported = 0
+        self.clicks = 0
+        self.error = None
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='cps-export', daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 1.0 if self.done.is_set() else 0.0
+        return min(1.0, self.exported / self.total)
+
+    @property
+    def outputs(self):
+        if self.include_clicks and self.fmt == 'csv':
+            return [self.path, clicks_path(self.path)]
+        return [self.path]
+
+    def run(self):
+        try:
+            self.total = self.store.count()
+            getattr(self, 'export_' + self.fmt)()
+        except ExportCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def chunks(self):
+        # Only one chunk of sessions (and its clicks) is alive at a time; the
+        # store pages through the history underneath.
+        number = 0
+        for chunk in chunked(self.store.iter_sessions(), self.chunk_size):
+            if self.cancelled.is_set():
+                raise ExportCancelled()
+            for session in chunk:
+                number += 1
+                session['session'] = number
+            yield chunk
+            self.exported += len(chunk)
+
+    def clicks_for(self, session):
+        if not self.include_clicks:
+            return None
+        clicks = load_clicks(session)
+        if clicks:
+            self.clicks += len(clicks)
+        return clicks
+
+    def export_csv(self):
+        def write(f, clicks_file=None):
+            text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+            writer = csv.DictWriter(text, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            if clicks_file is not None:
+                clicks_text = io.TextIOWrapper(clicks_file, encoding='utf-8', newline='')
+                clicks_writer = csv.writer(clicks_text)
+                clicks_writer.writerow(CLICK_FIELDS)
+            for chunk in self.chunks():
+                writer.writerows(chunk)
+                if clicks_file is not None:
+                    for session in chunk:
+                        clicks = self.clicks_for(session) or ()
+                        clicks_writer.writerows((session['session'], i, t) for i, t in enumerate(clicks))
+            text.flush()
+            text.detach()
+            if clicks_file is not None:
+                clicks_text.flush()
+                clicks_text.detach()
+
+        if self.include_clicks:
+            atomic_write(self.path, lambda f: atomic_write(clicks_path(self.path), lambda g: write(f, g)))
+        else:
+            atomic_write(self.path, write)
+
+    def export_ndjson(self):
+        def write(f):
+            for chunk in self.chunks():
+                lines = []
+                for session in chunk:
+                    clicks = self.clicks_for(session)
+                    if clicks is not None:
+                        session['clicks'] = clicks
+                    lines.append(json.dumps(session))
+                f.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+        atomic_write(self.path, write)
+
+    def export_npz(self):
+        import numpy as np
+
+        def column(chunk, field):
+            values = [session.get(field) for session in chunk]
+            if field in TEXT_FIELDS:
+                return np.array(['' if value is None else str(value) for value in values])
+            return np.array([np.nan if value is None else float(value) for value in values])
+
+        def write(f):
+            with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for index, chunk in enumerate(self.chunks()):
+                    for field in EXPORT_FIELDS:
+                        write_array(archive, f"{field}_{index:05d}", column(chunk, field))
+                    if self.include_clicks:
+                        sessions, offsets = [], []
+                        for session in chunk:
+                            clicks = self.clicks_for(session)
+                            if clicks:
+                                offsets.append(np.asarray(clicks, dtype=np.float64))
+                                sessions.append(np.full(len(clicks), session['session'], dtype=np.int64))
+                        write_array(archive, f"click_session_{index:05d}",
+                                    np.concatenate(sessions) if sessions else np.empty(0, dtype=np.int64))
+                        write_array(archive, f"click_offset_{index:05d}",
+                                    np.concatenate(offsets) if offsets else np.empty(0, dtype=np.float64))
+
+        atomic_write(self.path, write)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export session history (and click timelines)")
+    parser.add_argument('output', help="destination; the extension picks the format (.csv, .ndjson, .npz)")
+    parser.add_argument('--clicks', action='store_true', help="include per-click timelines")
+    parser.add_argument('--db', default='sessions.db')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    from cps_store import open_store
+    job = ExportJob(open_store(args.db), args.output, include_clicks=args.clicks,
+                    chunk_size=args.chunk_size).start()
+    try:
+        while not job.wait(0.5):
+            print(f"\r{job.exported}/{job.total} sessions", end='', flush=True)
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+        print("\nExport cancelled")
+        raise SystemExit(1)
+    if job.error is not None:
+        raise SystemExit(f"\nExport failed: {job.error}")
+    print(f"\r{job.exported} sessions, {job.clicks} clicks written to {', '.join(job.outputs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import math
+import time
+from collections import deque
+
+
+PLAYER_COLORS = ['#00ff00', '#ff3333', '#00ccff', '#ffcc00', '#cc66ff', '#ff9900', '#ffffff', '#ff66cc']
+
+
+def style_axes(ax):
+    ax.set_facecolor('#0a0a0a')
+    ax.set_xlabel('Time (Seconds)', color='white', fontsize=10)
+    ax.set_ylabel('Clicks Per Second', color='white', fontsize=10)
+    ax.tick_params(colors='white')
+    ax.grid(True, alpha=0.3, color='white')
+
+
+def axis_limits(max_time, max_cps):
+    # Grow the axes in coarse steps so the cached background stays valid
+    # for many frames instead of being invalidated on every sample.
+    x_max = max(10, math.ceil((max_time + 1) / 10) * 10)
+    y_max = max(25, math.ceil((max_cps + 5) / 5) * 5)
+    return x_max, y_max
+
+
+class GraphRenderer:
+    def __init__(self, fig, ax, canvas, fps=30):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.fps = fps
+        self.sources = []
+        self.lines = []
+        self.root = None
+        self.after_id = None
+        self.dirty = False
+        self.background = None
+        self.limits = (10, 25)
+        self.draw_times = deque(maxlen=500)
+        self.full_draws = 0
+        self.blits = 0
+        self.coalesced = 0
+
+        style_axes(ax)
+        ax.set_xlim(0, self.limits[0])
+        ax.set_ylim(0, self.limits[1])
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    @property
+    def interval_ms(self):
+        return max(1, int(round(1000 / self.fps)))
+
+    def set_fps(self, fps):
+        self.fps = max(1, int(fps))
+
+    def set_source(self, source):
+        self.set_sources([source])
+
+    def set_sources(self, sources):
+        # One animated line per source; colours follow PLAYER_COLORS so
+        # multiplayer lines match the player panels.
+        for line in self.lines[len(sources):]:
+            line.remove()
+        del self.lines[len(sources):]
+        while len(self.lines) < len(sources):
+            color = PLAYER_COLORS[len(self.lines) % len(PLAYER_COLORS)]
+            (line,) = self.ax.plot([], [], color=color, linewidth=2,
+                                   marker='o', markersize=1, animated=True)
+            self.lines.append(line)
+        self.sources = list(sources)
+        self.mark_dirty()
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def mark_dirty(self):
+        if self.dirty:
+            self.coalesced += 1
+        self.dirty = True
+
+    def start(self, root):
+        self.root = root
+        if self.after_id is None:
+            self.after_id = root.after(self.interval_ms, self.tick)
+
+    def stop(self):
+        if self.root is not None and self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        self.after_id = None
+
+    def tick(self):
+        self.after_id = None
+        if self.dirty:
+            self.render()
+        if self.root is not None:
+            self.after_id = self.root.after(self.interval_ms, self.tick)
+
+    def render(self):
+        self.dirty = False
+        start = time.perf_counter()
+
+        max_points = max(3, int(self.ax.bbox.width))
+        max_time = max_cps = 0
+        for line, source in zip(self.lines, self.sources):
+            xs, ys = source(max_points)
+            line.set_data(xs, ys)
+            if len(xs):
+                max_time = max(max_time, max(xs))
+                max_cps = max(max_cps, max(ys))
+        limits = axis_limits(max_time, max_cps)
+
+        if limits != self.limits or self.background is None:
+            self.limits = limits
+            self.ax.set_xlim(0, limits[0])
+            self.ax.set_ylim(0, limits[1])
+            self.canvas.draw()
+            self.full_draws += 1
+        else:
+            self.canvas.restore_region(self.background)
+            for line in self.lines:
+                self.ax.draw_artist(line)
+            self.canvas.blit(self.ax.bbox)
+            self.blits += 1
+
+        self.draw_times.append((time.perf_counter() - start) * 1000)
+
+    def reset(self):
+        self.dirty = False
+        for line in self.lines:
+            line.set_data([], [])
+        self.limits = (10, 25)
+        self.ax.set_xlim(0, self.limits[0])
+        self.ax.set_ylim(0, self.limits[1])
+        self.canvas.draw()
+        self.draw_times.clear()
+        self.full_draws = 0
+        self.blits = 0
+        self.coalesced = 0
+
+    def stats(self):
+        times = sorted(self.draw_times)
+        if not times:
+            return {'frames': 0, 'full_draws': 0, 'blits': 0, 'coalesced': self.coalesced,
+                    'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'frames': self.full_draws + self.blits,
+            'full_draws': self.full_draws,
+            'blits': self.blits,
+            'coalesced': self.coalesced,
+            'mean_ms': sum(times) / len(times),
+            'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+            'max_ms': times[-1],
+        }
+
+
+class NullGraph:
+    def __init__(self, fps=30):
+        self.fps = fps
+        self.draw_times = ()
+
+    def set_fps(self, fps):
+        self.fps = max(1, int(fps))
+
+    def set_source(self, source):
+        pass
+
+    def set_sources(self, sources):
+        pass
+
+    def mark_dirty(self):
+        pass
+
+    def start(self, root):
+        pass
+
+    def stop(self):
+        pass
+
+    def reset(self):
+        pass
+
+    def stats(self):
+        return {'frames': 0, 'full_draws': 0, 'blits': 0, 'coalesced': 0,
+                'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
@@ -0,0 +1,85 @@
+from array import array
+
+RELEASE_DELAY_MS = 10
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class InputLatency:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.deltas = array('d')
+
+    def record(self, event_ms, handler_ms):
+        # Tk event times come from the windowing system with an unknown
+        # epoch, so keep raw differences and treat the smallest one seen as
+        # zero latency when summarising.
+        self.deltas.append(handler_ms - event_ms)
+
+    def __len__(self):
+        return len(self.deltas)
+
+    def summary(self):
+        if not self.deltas:
+            return {'samples': 0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        values = sorted(self.deltas)
+        base = values[0]
+        return {
+            'samples': len(values),
+            'p50_ms': percentile(values, 0.5) - base,
+            'p95_ms': percentile(values, 0.95) - base,
+            'p99_ms': percentile(values, 0.99) - base,
+            'max_ms': values[-1] - base,
+        }
+
+
+class KeyRepeatFilter:
+    def __init__(self, root, keys=(), release_delay_ms=RELEASE_DELAY_MS):
+        self.root = root
+        self.keys = set(keys)
+        self.release_delay_ms = release_delay_ms
+        self.down = set()
+        self.pending = {}
+
+    def set_keys(self, keys):
+        for after_id, _ in self.pending.values():
+            self.root.after_cancel(after_id)
+        self.pending.clear()
+        self.keys = set(keys)
+        self.down.clear()
+
+    def press(self, keysym, time=None):
+        if keysym not in self.keys:
+            return False
+        pending = self.pending.pop(keysym, None)
+        if pending is not None:
+            after_id, released = pending
+            self.root.after_cancel(after_id)
+            if time is not None and time == released:
+                # X11 auto-repeat sends a KeyRelease/KeyPress pair with the
+                # same timestamp; the key never actually went up.
+                return False
+            self.down.discard(keysym)
+        if keysym in self.down:
+            return False
+        self.down.add(keysym)
+        return True
+
+    def release(self, keysym, time=None):
+        # Held back for a moment so an auto-repeat press can cancel it.
+        if keysym not in self.down or keysym in self.pending:
+            return
+        after_id = self.root.after(self.release_delay_ms, self.finish_release, keysym)
+        self.pending[keysym] = (after_id, time)
+
+    def finish_release(self, keysym):
+        self.pending.pop(keysym, None)
+        self.down.discard(keysym)
+
+
+def parse_keys(text):
+    return [key.strip() for key in text.split(',') if key.strip()]
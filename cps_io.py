@@ -0,0 +1,95 @@
+import json
+import os
+import queue
+import tempfile
+import threading
+
+
+def atomic_write(path, write):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Persist the rename itself; not supported on Windows, where
+    # os.replace is already durable enough for our purposes.
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_json(path, obj, **kwargs):
+    atomic_write(path, lambda f: f.write(json.dumps(obj, **kwargs).encode('utf-8')))
+
+
+class PersistenceWorker:
+    def __init__(self, name='cps-io'):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.queue = queue.Queue()
+        self.writes = 0
+        self.coalesced = 0
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, key, func, *args):
+        # Only the newest job per key runs; a save that is superseded before
+        # the worker reaches it is dropped.
+        with self.lock:
+            if key in self.pending:
+                self.coalesced += 1
+                self.pending[key] = ('replace', func, args)
+                return
+            self.pending[key] = ('replace', func, args)
+        self.queue.put(key)
+
+    def append(self, key, func, item):
+        # Items for the same key are handed to func as one batch, so a burst of
+        # appends becomes a single transaction.
+        with self.lock:
+            job = self.pending.get(key)
+            if job is not None:
+                self.coalesced += 1
+                job[2].append(item)
+                return
+            self.pending[key] = ('append', func, [item])
+        self.queue.put(key)
+
+    def run(self):
+        while True:
+            key = self.queue.get()
+            try:
+                if key is None:
+                    return
+                with self.lock:
+                    kind, func, args = self.pending.pop(key)
+                try:
+                    if kind == 'append':
+                        func(args)
+                    else:
+                        func(*args)
+                    self.writes += 1
+                except Exception as e:
+                    print(f"Background write failed ({key}): {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self, timeout=10):
+        self.queue.put(None)
+        self.thread.join(timeout)
@@ -0,0 +1,165 @@
+import json
+import os
+import queue
+import socket
+import threading
+import uuid
+
+from cps_io import atomic_write_json
+
+BATCH_SIZE = 50
+BATCH_DELAY = 2.0
+MAX_BACKOFF = 60.0
+
+
+def parse_address(address, default_port=8765):
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, default_port
+    return host, int(port)
+
+
+def request(address, payload, timeout=5.0):
+    with socket.create_connection(parse_address(address), timeout=timeout) as sock:
+        sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError('leaderboard closed the connection')
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error', 'leaderboard request failed'))
+    return response
+
+
+class LeaderboardClient:
+    def __init__(self, address, station, outbox_path='leaderboard_outbox.json', outbox=None):
+        self.address = address
+        self.station = station
+        self.outbox_path = outbox_path
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.outbox = self.load_outbox() if outbox is None else outbox
+        self.closed = False
+        self.queue = queue.Queue()
+        self.sent = 0
+        self.failures = 0
+        self.thread = threading.Thread(target=self.run, name='cps-leaderboard', daemon=True)
+        self.thread.start()
+
+    def load_outbox(self):
+        try:
+            with open(self.outbox_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Failed to read leaderboard outbox - starting empty ({e})")
+            return []
+
+    def save_outbox(self):
+        # Writes are serialised and each takes its snapshot inside save_lock,
+        # so whichever write lands last holds the newest outbox.  The outbox
+        # lock is only held for the copy, never across the fsync.
+        with self.save_lock:
+            with self.lock:
+                if self.closed:
+                    return
+                outbox = list(self.outbox)
+            self.write_outbox(outbox)
+
+    def write_outbox(self, outbox):
+        try:
+            if outbox:
+                atomic_write_json(self.outbox_path, outbox)
+            elif os.path.exists(self.outbox_path):
+                os.remove(self.outbox_path)
+        except OSError as e:
+            print(f"Failed to save leaderboard outbox: {e}")
+
+    def submit(self, session):
+        entry = {
+            'id': f"{self.station}:{uuid.uuid4().hex}",
+            'station': self.station,
+            'mode': session['mode'],
+            'time_limit': session['time_limit'],
+            'final_cps': session['final_cps'],
+            'total_clicks': session['total_clicks'],
+            'timestamp': session['timestamp'],
+        }
+        # Called from the Tk thread, so only the in-memory append happens
+        # here; the sender thread writes the outbox file.
+        with self.lock:
+            self.outbox.append(entry)
+        self.queue.put(entry)
+
+    def top(self, mode, time_limit, k=10):
+        return request(self.address, {'op': 'top', 'mode': mode, 'time_limit': time_limit, 'k': k})['entries']
+
+    def run(self):
+        backoff = BATCH_DELAY
+        while True:
+            # Wait for work, then linger briefly so a burst goes out as one batch.
+            # submit() has already put entries in the outbox; the queue only
+            # wakes this thread up.  Each wake-up saves the outbox before any
+            # network attempt, so nothing is lost if the game exits during the
+            # linger or while a request is still timing out.
+            timeout = None if not self.outbox else backoff
+            try:
+                item = self.queue.get(timeout=timeout)
+                self.save_outbox()
+                while item is not None and len(self.outbox) < BATCH_SIZE:
+                    item = self.queue.get(timeout=BATCH_DELAY)
+                    self.save_outbox()
+                if item is None:
+                    self.flush()
+                    return
+            except queue.Empty:
+                pass
+            if self.flush():
+                backoff = BATCH_DELAY
+            else:
+                backoff = min(MAX_BACKOFF, backoff * 2)
+
+    def flush(self):
+        # Submission ids make retries idempotent on the server, so a batch that
+        # timed out after being applied can safely be sent again.  The lock is
+        # only held around the outbox, never across a request.
+        try:
+            while True:
+                with self.lock:
+                    if self.closed:
+                        return True
+                    batch = self.outbox[:BATCH_SIZE]
+                    if not batch:
+                        return True
+                request(self.address, {'op': 'submit', 'sessions': batch})
+                with self.lock:
+                    if self.closed:
+                        return True
+                    del self.outbox[:len(batch)]
+                    self.sent += len(batch)
+                self.save_outbox()
+        except (OSError, ValueError, RuntimeError) as e:
+            self.failures += 1
+            if self.failures == 1 or self.failures % 10 == 0:
+                print(f"Leaderboard unreachable, {len(self.outbox)} sessions queued ({e})")
+            return False
+
+    def detach(self):
+        # Stop this client and hand over what it has not sent.  Its thread may
+        # still be inside a request, but it starts no new outbox writes once
+        # this returns; one already under way only holds handed-over entries.
+        with self.lock:
+            self.closed = True
+            outbox, self.outbox = self.outbox, []
+        self.queue.put(None)
+        return outbox
+
+    def close(self, timeout=5):
+        self.queue.put(None)
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            # Still stuck in a request: save whatever arrived since its last
+            # write before the process exits.
+            self.save_outbox()
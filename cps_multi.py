@@ -0,0 +1,290 @@
+import tkinter as tk
+from tkinter import messagebox
+
+from cps_clock import GameClock, LoopScheduler
+from cps_core import MAX_PLAYERS, MultiplayerCore
+from cps_graph import PLAYER_COLORS, GraphRenderer, NullGraph
+from cps_input import KeyRepeatFilter
+from cps_view import ViewModel, next_refresh_delay
+
+DEFAULT_KEYS = ['a', 'l', 'z', 'm', 'q', 'p', 'x', 'n']
+MOUSE_KEYS = {'mouse1': 1, 'mouse2': 2, 'mouse3': 3}
+
+
+def default_players(count=2):
+    return [{'name': f"Player {i + 1}", 'key': DEFAULT_KEYS[i]} for i in range(count)]
+
+
+class MultiplayerWindow:
+    def __init__(self, game):
+        self.game = game
+        self.window = tk.Toplevel(game.root)
+        self.window.title("Multiplayer")
+        self.window.geometry("1000x720")
+        self.window.configure(bg='#0a0a0a')
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.players = [dict(player) for player in game.settings['multiplayer_players']] or default_players()
+        self.clock = GameClock()
+        self.scheduler = LoopScheduler(self.window, self.clock)
+        self.core = None
+        self.view = ViewModel()
+        self.keys = KeyRepeatFilter(self.window)
+        self.key_map = {}
+        self.rows = []
+        self.game_timer = None
+        self.display_after = None
+        self.graph = NullGraph(fps=game.settings['graph_fps'])
+
+        self.setup_ui()
+        self.window.bind('<KeyPress>', self.on_key_press)
+        self.window.bind('<KeyRelease>', self.on_key_release)
+
+    def setup_ui(self):
+        header = tk.Frame(self.window, bg='#0a0a0a')
+        header.pack(fill='x', padx=15, pady=(15, 5))
+        tk.Label(header, text="Hot-Seat Multiplayer", font=('Courier New', 22, 'bold'),
+                fg='#00ff00', bg='#0a0a0a').pack(side='left')
+        self.timer_label = tk.Label(header, text="Game Ready - Press Start!",
+                                   font=('Courier New', 14, 'bold'),
+                                   fg='#ffffff', bg='#0a0a0a')
+        self.timer_label.pack(side='right')
+
+        count_frame = tk.Frame(self.window, bg='#0a0a0a')
+        count_frame.pack(fill='x', padx=15)
+        tk.Label(count_frame, text="Players:", font=('Courier New', 12, 'bold'),
+                fg='#00ff00', bg='#0a0a0a').pack(side='left', padx=(0, 5))
+        self.count_var = tk.IntVar(value=len(self.players))
+        for count in range(2, MAX_PLAYERS + 1):
+            tk.Radiobutton(count_frame, text=str(count), value=count,
+                          font=('Courier New', 12),
+                          fg='#ffffff', bg='#0a0a0a',
+                          selectcolor='#333333',
+                          variable=self.count_var,
+                          command=self.set_player_count).pack(side='left')
+        tk.Label(count_frame, text="Keys: any key, or mouse1 / mouse2 / mouse3 on the pad below",
+                font=('Courier New', 10), fg='#888888', bg='#0a0a0a').pack(side='right')
+
+        self.players_frame = tk.Frame(self.window, bg='#1a1a1a', relief='raised', bd=3)
+        self.players_frame.pack(fill='x', padx=15, pady=10)
+        self.build_rows()
+
+        body = tk.Frame(self.window, bg='#0a0a0a')
+        body.pack(fill='both', expand=True, padx=15)
+
+        self.pad = tk.Label(body, text="CLICK PAD\n(mouse buttons)", width=18,
+                           font=('Courier New', 16, 'bold'),
+                           bg='#333333', fg='#ffffff', relief='raised', bd=6)
+        self.pad.pack(side='left', fill='y', padx=(0, 10))
+        for button in MOUSE_KEYS.values():
+            self.pad.bind(f'<ButtonPress-{button}>', self.on_mouse_press)
+
+        self.graph_frame = tk.Frame(body, bg='#1a1a1a', relief='raised', bd=3)
+        self.graph_frame.pack(side='left', fill='both', expand=True)
+        if self.game.figure_backend is not None:
+            self.attach_graph(*self.game.figure_backend)
+        else:
+            tk.Label(self.graph_frame, text="Graph Unavailable", font=('Courier New', 14),
+                    fg='#888888', bg='#1a1a1a').pack(expand=True)
+
+        buttons = tk.Frame(self.window, bg='#0a0a0a')
+        buttons.pack(fill='x', padx=15, pady=15)
+        self.start_button = tk.Button(buttons, text="Start Game",
+                                     font=('Courier New', 12, 'bold'),
+                                     bg='#00ff00', fg='#000000',
+                                     activebackground='#00cc00',
+                                     relief='raised', bd=3,
+                                     command=self.toggle_game,
+                                     cursor='hand2')
+        self.start_button.pack(side='left', expand=True, fill='x', padx=5)
+        tk.Button(buttons, text="Reset Game",
+                 font=('Courier New', 12, 'bold'),
+                 bg='#ff3333', fg='#ffffff',
+                 activebackground='#cc0000',
+                 relief='raised', bd=3,
+                 command=self.reset_game,
+                 cursor='hand2').pack(side='left', expand=True, fill='x', padx=5)
+
+    def attach_graph(self, Figure, FigureCanvasTkAgg):
+        fig = Figure(figsize=(6, 4), facecolor='#1a1a1a')
+        ax = fig.add_subplot()
+        canvas = FigureCanvasTkAgg(fig, self.graph_frame)
+        canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+        self.graph = GraphRenderer(fig, ax, canvas, fps=self.graph.fps)
+        self.graph.start(self.window)
+
+    def build_rows(self):
+        for child in self.players_frame.winfo_children():
+            child.destroy()
+        self.rows = []
+        self.view = ViewModel()
+        for column, title in enumerate(["", "Name", "Key", "Clicks", "CPS", "Max CPS"]):
+            tk.Label(self.players_frame, text=title, font=('Courier New', 11, 'bold'),
+                    fg='#00ff00', bg='#1a1a1a').grid(row=0, column=column, padx=8, pady=(8, 2), sticky='w')
+        for index, player in enumerate(self.players):
+            row = {'name': tk.StringVar(value=player['name']), 'key': tk.StringVar(value=player['key'])}
+            color = PLAYER_COLORS[index % len(PLAYER_COLORS)]
+            tk.Label(self.players_frame, text="■", font=('Courier New', 14),
+                    fg=color, bg='#1a1a1a').grid(row=index + 1, column=0, padx=8)
+            row['entries'] = [
+                tk.Entry(self.players_frame, textvariable=row['name'], width=14,
+                        font=('Courier New', 11), fg='#ffffff', bg='#333333',
+                        insertbackground='#ffffff'),
+                tk.Entry(self.players_frame, textvariable=row['key'], width=8,
+                        font=('Courier New', 11), fg='#ffffff', bg='#333333',
+                        insertbackground='#ffffff'),
+            ]
+            for column, entry in enumerate(row['entries'], start=1):
+                entry.grid(row=index + 1, column=column, padx=8, pady=2, sticky='w')
+            for column, stat in enumerate(['clicks', 'cps', 'max_cps'], start=3):
+                label = tk.Label(self.players_frame, text="0", width=8, anchor='w',
+                                font=('Courier New', 14, 'bold'), fg=color, bg='#1a1a1a')
+                label.grid(row=index + 1, column=column, padx=8, pady=2, sticky='w')
+                self.view.bind(f"{stat}{index}", lambda text, label=label: label.config(text=text))
+            self.rows.append(row)
+
+    def read_rows(self):
+        return [{'name': row['name'].get().strip() or f"Player {i + 1}",
+                 'key': row['key'].get().strip()} for i, row in enumerate(self.rows)]
+
+    def set_player_count(self):
+        if self.core is not None and self.core.game_active:
+            self.count_var.set(len(self.players))
+            return
+        count = self.count_var.get()
+        players = self.read_rows()[:count]
+        used = {player['key'] for player in players}
+        for i in range(len(players), count):
+            key = next((key for key in DEFAULT_KEYS if key not in used), '')
+            used.add(key)
+            players.append({'name': f"Player {i + 1}", 'key': key})
+        self.players = players
+        self.build_rows()
+
+    def toggle_game(self):
+        if self.core is not None and self.core.game_active:
+            self.end_game()
+        else:
+            self.start_game()
+
+    def start_game(self):
+        players = self.read_rows()
+        keys = [player['key'] for player in players]
+        if not all(keys) or len(set(keys)) != len(keys):
+            messagebox.showerror("Multiplayer", "Every Player Needs A Different Key.", parent=self.window)
+            return
+        self.players = players
+        self.game.settings['multiplayer_players'] = players
+        self.game.save_settings()
+
+        self.core = MultiplayerCore([player['name'] for player in players],
+                                    self.game.core.game_mode, self.game.core.time_limit, self.clock)
+        self.key_map = {key: index for index, key in enumerate(keys)}
+        self.keys.set_keys([key for key in keys if key not in MOUSE_KEYS])
+        self.graph.reset()
+        self.graph.set_sources([player.graph_points for player in self.core.players])
+
+        self.core.start()
+        for row in self.rows:
+            for entry in row['entries']:
+                entry.config(state='disabled')
+        self.start_button.config(text="Stop Game", bg='#ffcc00')
+        if self.core.game_mode == "Time Trial":
+            self.game_timer = self.scheduler.call_at(self.core.deadline(), self.end_game)
+        self.request_refresh()
+
+    def end_game(self):
+        if self.core is None or not self.core.game_active:
+            return
+        if self.game_timer:
+            self.game_timer.cancel()
+            self.game_timer = None
+        sessions = self.core.end()
+        self.request_refresh()
+        self.finish_ui()
+
+        for session in sessions:
+            self.game.save_session_data(session)
+        if not sessions:
+            return
+        lines = [f"{place}. {session['player']}: {session['total_clicks']} Clicks, "
+                 f"{session['final_cps']:.2f} CPS (Max {session['max_cps']:.1f})"
+                 + (" - Auto-Clicker Suspected" if session['autoclick_flagged'] else "")
+                 for place, session in enumerate(sessions, start=1)]
+        messagebox.showinfo("Race Complete!", f"{sessions[0]['player']} Wins!\n\n" + "\n".join(lines),
+                            parent=self.window)
+
+    def finish_ui(self):
+        for row in self.rows:
+            for entry in row['entries']:
+                entry.config(state='normal')
+        self.start_button.config(text="Start Game", bg='#00ff00')
+
+    def reset_game(self):
+        if self.game_timer:
+            self.game_timer.cancel()
+            self.game_timer = None
+        if self.core is not None:
+            self.core.reset()
+        self.finish_ui()
+        self.graph.reset()
+        self.request_refresh()
+
+    def on_key_press(self, event):
+        now = self.clock()
+        if self.keys.press(event.keysym, event.time):
+            self.on_click(self.key_map[event.keysym], now)
+
+    def on_key_release(self, event):
+        self.keys.release(event.keysym, event.time)
+
+    def on_mouse_press(self, event):
+        now = self.clock()
+        index = self.key_map.get(f"mouse{event.num}")
+        if index is not None:
+            self.on_click(index, now)
+
+    def on_click(self, index, now):
+        if self.core is None or self.core.click(index, now) is None:
+            return
+        self.graph.mark_dirty()
+        self.request_refresh()
+
+    def request_refresh(self):
+        if self.display_after is None:
+            self.display_after = self.window.after_idle(self.update_display)
+
+    def update_display(self):
+        self.display_after = None
+        if self.core is None:
+            return
+        now = self.clock()
+        for index, player in enumerate(self.core.players):
+            self.view.set(f"clicks{index}", str(player.clicks))
+            self.view.set(f"cps{index}", f"{player.smoothed_cps(now):.1f}")
+            self.view.set(f"max_cps{index}", f"{player.max_cps:.1f}")
+        self.view.flush()
+
+        if not self.core.game_active:
+            self.timer_label.config(text="Game Ready - Press Start!")
+            return
+        if self.core.game_mode == "Time Trial":
+            self.timer_label.config(text=f"Time Remaining: {self.core.remaining(now):.1f}s")
+        else:
+            self.timer_label.config(text=f"Elapsed Time: {self.core.elapsed(now):.1f}s")
+        self.graph.mark_dirty()
+        self.display_after = self.scheduler.call_at(now + next_refresh_delay(self.core, now),
+                                                     self.update_display)
+
+    def close(self):
+        if self.core is not None and self.core.game_active:
+            self.end_game()
+        if self.display_after is not None:
+            if hasattr(self.display_after, 'cancel'):
+                self.display_after.cancel()
+            else:
+                self.window.after_cancel(self.display_after)
+            self.display_after = None
+        self.graph.stop()
+        self.game.multiplayer = None
+        self.window.destroy()
@@ -0,0 +1,119 @@
+import time
+from collections import deque
+
+from cps_input import percentile
+
+HISTORY = 2000
+PROBE_INTERVAL = 0.1
+DRAW_EDGES_MS = [1, 2, 4, 8, 16, 33, 66]
+
+
+def summarize(values):
+    values = sorted(values)
+    if not values:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'count': len(values),
+        'mean_ms': sum(values) / len(values),
+        'p50_ms': percentile(values, 0.5),
+        'p95_ms': percentile(values, 0.95),
+        'p99_ms': percentile(values, 0.99),
+        'max_ms': values[-1],
+    }
+
+
+def histogram(values, edges=DRAW_EDGES_MS):
+    counts = [0] * (len(edges) + 1)
+    for value in values:
+        for i, edge in enumerate(edges):
+            if value <= edge:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={edge}ms" for edge in edges] + [f">{edges[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+class NullMonitor:
+    enabled = False
+
+    def begin(self):
+        pass
+
+    def lap(self, stage):
+        pass
+
+    def stop(self):
+        pass
+
+
+class PerfMonitor:
+    enabled = True
+
+    def __init__(self, root, history=HISTORY, probe_interval=PROBE_INTERVAL):
+        self.root = root
+        self.history = history
+        self.probe_ms = max(1, int(probe_interval * 1000))
+        self.stages = {}
+        self.loop_lag = deque(maxlen=history)
+        self.last = 0
+        self.expected = None
+        self.probe_after = None
+        self.probe()
+
+    def begin(self):
+        self.last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        # Each lap is the time since begin() or the previous lap, so one
+        # handler can be split into consecutive stages without nesting.
+        now = time.perf_counter_ns()
+        samples = self.stages.get(stage)
+        if samples is None:
+            samples = self.stages[stage] = deque(maxlen=self.history)
+        samples.append((now - self.last) / 1e6)
+        self.last = now
+
+    def probe(self):
+        # A bare after() timer, not LoopScheduler: this measures how late Tk
+        # itself runs callbacks, before any correction.
+        now = time.perf_counter()
+        if self.expected is not None:
+            self.loop_lag.append(max(0.0, now - self.expected) * 1000)
+        self.expected = now + self.probe_ms / 1000
+        self.probe_after = self.root.after(self.probe_ms, self.probe)
+
+    def stop(self):
+        if self.probe_after is not None:
+            self.root.after_cancel(self.probe_after)
+            self.probe_after = None
+
+    def report(self, draw_times=(), scheduler=None, input_latency=None):
+        report = {
+            'loop_lag': summarize(self.loop_lag),
+            'stages': {stage: summarize(samples) for stage, samples in self.stages.items()},
+            'draw': summarize(draw_times),
+            'draw_histogram': histogram(draw_times),
+        }
+        if scheduler is not None:
+            report['scheduler'] = scheduler
+        if input_latency is not None:
+            report['input_latency'] = input_latency
+        return report
+
+
+def format_report(report):
+    lag = report['loop_lag']
+    lines = [f"loop lag   p50 {lag['p50_ms']:5.1f}  p99 {lag['p99_ms']:5.1f}  max {lag['max_ms']:6.1f} ms"]
+    for stage, stats in report['stages'].items():
+        lines.append(f"{stage:<10} p50 {stats['p50_ms']:5.2f}  p99 {stats['p99_ms']:5.2f}  max {stats['max_ms']:6.2f} ms")
+    draw = report['draw']
+    lines.append(f"draw       p50 {draw['p50_ms']:5.1f}  p99 {draw['p99_ms']:5.1f}  max {draw['max_ms']:6.1f} ms")
+    peak = max(report['draw_histogram'].values()) or 1
+    for label, count in report['draw_histogram'].items():
+        lines.append(f"  {label:>7} {'#' * round(20 * count / peak):<20} {count}")
+    if 'input_latency' in report:
+        latency = report['input_latency']
+        lines.append(f"input      p50 {latency['p50_ms']:5.1f}  p99 {latency['p99_ms']:5.1f}  max {latency['max_ms']:6.1f} ms")
+    return '\n'.join(lines)
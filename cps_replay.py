@@ -0,0 +1,260 @@
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import time
+
+from cps_io import atomic_write
+
+MAGIC = b'CPSR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIQQI')
+TICK_NS = 1000
+MAX_VARINT = 9
+META_FIELDS = ['timestamp', 'mode', 'time_limit', 'total_clicks', 'total_time', 'final_cps', 'max_cps']
+
+
+def encode_varints(values):
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def to_ticks(offsets, tick_ns=TICK_NS):
+    # Quantise to whole ticks first and difference afterwards, so rounding
+    # never accumulates along the timeline.
+    scale = 1e9 / tick_ns
+    deltas, previous = [], 0
+    for offset in offsets:
+        ticks = max(previous, round(offset * scale))
+        deltas.append(ticks - previous)
+        previous = ticks
+    return deltas
+
+
+def decode_varints(buf, count):
+    try:
+        import numpy as np
+    except ImportError:
+        return _decode_varints_py(buf, count)
+    if not count:
+        return np.empty(0, dtype=np.uint64)
+    data = np.frombuffer(buf, dtype=np.uint8)
+    ends = np.flatnonzero(data < 0x80)
+    if len(ends) < count:
+        raise ValueError('truncated replay data')
+    ends = ends[:count]
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    if lengths.max() > MAX_VARINT:
+        raise ValueError('corrupt replay data')
+    data = data[:ends[-1] + 1]
+    # Every byte contributes its low seven bits shifted by its position in
+    # the varint; summing per varint rebuilds all values in a few passes.
+    position = np.arange(len(data)) - np.repeat(starts, lengths)
+    parts = (data & 0x7f).astype(np.uint64) << (7 * position).astype(np.uint64)
+    return np.add.reduceat(parts, starts)
+
+
+def _decode_varints_py(buf, count):
+    values, value, shift = [], 0, 0
+    if not count:
+        return values
+    for byte in bytes(buf):
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            values.append(value)
+            if len(values) == count:
+                return values
+            value, shift = 0, 0
+        else:
+            shift += 7
+            if shift >= 7 * MAX_VARINT:
+                raise ValueError('corrupt replay data')
+    raise ValueError('truncated replay data')
+
+
+class Replay:
+    def __init__(self, meta, count, tick_ns, payload, owner=None):
+        self.meta = meta
+        self.count = count
+        self.tick_ns = tick_ns
+        self.payload = payload
+        self.owner = owner
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return len(self.payload)
+
+    def deltas(self):
+        return decode_varints(self.payload, self.count)
+
+    def offsets(self):
+        deltas = self.deltas()
+        if isinstance(deltas, list):
+            offsets, ticks = [], 0
+            for delta in deltas:
+                ticks += delta
+                offsets.append(ticks * self.tick_ns / 1e9)
+            return offsets
+        return deltas.cumsum() * (self.tick_ns / 1e9)
+
+    @property
+    def duration(self):
+        if 'total_time' in self.meta:
+            return self.meta['total_time']
+        offsets = self.offsets()
+        return float(offsets[-1]) if len(offsets) else 0.0
+
+    def close(self):
+        if isinstance(self.payload, memoryview):
+            self.payload.release()
+        if self.owner is not None:
+            self.owner.close()
+            self.owner = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pack_replay(offsets, meta=None, tick_ns=TICK_NS):
+    payload = encode_varints(to_ticks(offsets, tick_ns))
+    meta = json.dumps(meta or {}, separators=(',', ':')).encode('utf-8')
+    count = len(offsets)
+    return HEADER.pack(MAGIC, VERSION, 0, tick_ns, count, len(payload), len(meta)) + meta + payload
+
+
+def save_replay(path, offsets, meta=None, tick_ns=TICK_NS):
+    data = pack_replay(list(offsets), meta, tick_ns)
+    atomic_write(path, lambda f: f.write(data))
+
+
+def parse_replay(buf, owner=None):
+    view = memoryview(buf)
+    if len(view) < HEADER.size:
+        raise ValueError('truncated replay header')
+    magic, version, _, tick_ns, count, payload_len, meta_len = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError('not a replay file')
+    if version != VERSION:
+        raise ValueError(f'unsupported replay version {version}')
+    start = HEADER.size + meta_len
+    if len(view) < start + payload_len:
+        raise ValueError('truncated replay data')
+    meta = json.loads(bytes(view[HEADER.size:start]).decode('utf-8')) if meta_len else {}
+    return Replay(meta, count, tick_ns, view[start:start + payload_len], owner)
+
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise ValueError('empty replay file')
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return parse_replay(mapped, mapped)
+    except Exception:
+        mapped.close()
+        raise
+
+
+class ReplayPlayer:
+    def __init__(self, offsets, start, end=None):
+        self.times = [start + float(offset) for offset in offsets]
+        self.index = 0
+        self.end = start + end if end is not None else (self.times[-1] if self.times else start)
+
+    def due(self, now):
+        begin = self.index
+        while self.index < len(self.times) and self.times[self.index] <= now:
+            self.index += 1
+        return self.times[begin:self.index]
+
+    def next_time(self):
+        if self.index < len(self.times):
+            return self.times[self.index]
+        return None
+
+    @property
+    def finished(self):
+        return self.index >= len(self.times)
+
+
+def verify(replay, full=False, tolerance=1e-3):
+    # Recompute the recorded summary from the clicks themselves.  The quick
+    # check is vectorised; --full replays through GameCore for max CPS too.
+    meta = replay.meta
+    offsets = replay.offsets()
+    problems = []
+    if 'total_clicks' in meta and meta['total_clicks'] != replay.count:
+        problems.append(f"clicks {replay.count} != recorded {meta['total_clicks']}")
+    if replay.count and 'total_time' in meta:
+        if float(offsets[-1]) > meta['total_time'] + tolerance:
+            problems.append("click after the recorded end of the game")
+        if meta.get('total_time') and 'final_cps' in meta:
+            final_cps = replay.count / meta['total_time']
+            if abs(final_cps - meta['final_cps']) > tolerance * max(1.0, final_cps):
+                problems.append(f"final CPS {final_cps:.3f} != recorded {meta['final_cps']:.3f}")
+    if full and replay.count and 'max_cps' in meta:
+        from cps_core import GameCore
+        core = GameCore(meta.get('mode', "Endless Mode"), meta.get('time_limit', 10))
+        core.start(0.0)
+        for t in offsets:
+            core.click(float(t))
+        if abs(core.max_cps - meta['max_cps']) > tolerance * max(1.0, core.max_cps):
+            problems.append(f"max CPS {core.max_cps:.3f} != recorded {meta['max_cps']:.3f}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and verify CPS replay files")
+    parser.add_argument('paths', nargs='+', help="replay files or directories")
+    parser.add_argument('--full', action='store_true', help="replay every session through GameCore")
+    parser.add_argument('--quiet', action='store_true', help="only print failures and the summary")
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, '*.cpsr'))))
+        else:
+            paths.append(path)
+
+    start = time.perf_counter()
+    clicks = nbytes = failed = 0
+    for path in paths:
+        try:
+            with load_replay(path) as replay:
+                problems = verify(replay, args.full)
+                clicks += replay.count
+                nbytes += replay.nbytes
+        except (OSError, ValueError) as e:
+            problems = [str(e)]
+        if problems:
+            failed += 1
+            print(f"FAIL {path}: {'; '.join(problems)}")
+        elif not args.quiet:
+            print(f"ok   {path}")
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(paths)} replays, {clicks} clicks ({nbytes / max(1, clicks):.2f} bytes/click) "
+          f"verified in {elapsed:.2f}s, {failed} failed")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
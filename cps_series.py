@@ -0,0 +1,157 @@
+import math
+from collections import deque
+
+TIERS = ((0.01, 2000), (0.1, 3000))
+COARSE_WIDTH = 1.0
+COARSE_CAPACITY = 3600
+CPS_WINDOW = 1.0
+
+
+class Tier:
+    def __init__(self, width, capacity):
+        self.width = width
+        self.capacity = capacity
+        self.counts = deque(maxlen=capacity)
+        self.first = 0
+
+    def add(self, t):
+        index = int(t / self.width)
+        end = self.first + len(self.counts)
+        if index >= end:
+            gap = index - end + 1
+            if gap > self.capacity:
+                self.counts.clear()
+                self.first = index - self.capacity + 1
+                gap = self.capacity
+            dropped = max(0, len(self.counts) + gap - self.capacity)
+            self.counts.extend([0] * gap)
+            self.first += dropped
+        if index >= self.first:
+            self.counts[index - self.first] += 1
+
+    def covers_start(self):
+        return self.first == 0
+
+    def clear(self):
+        self.counts.clear()
+        self.first = 0
+
+
+class CoarseTier:
+    def __init__(self, width, capacity):
+        self.base_width = width
+        self.capacity = capacity
+        self.clear()
+
+    def extend_to(self, t):
+        index = int(t / self.width)
+        # Halve the resolution instead of dropping history, so the whole
+        # session always fits in `capacity` buckets.
+        while index >= self.capacity:
+            self.counts = [sum(self.counts[i:i + 2]) for i in range(0, len(self.counts), 2)]
+            self.width *= 2
+            index = int(t / self.width)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index - len(self.counts) + 1))
+        return index
+
+    def add(self, t):
+        # extend_to() may replace self.counts, so index it afterwards.
+        index = self.extend_to(t)
+        self.counts[index] += 1
+
+    def covers_start(self):
+        return True
+
+    def clear(self):
+        self.width = self.base_width
+        self.counts = []
+        self.first = 0
+
+
+class ClickSeries:
+    def __init__(self, tiers=TIERS, coarse=(COARSE_WIDTH, COARSE_CAPACITY), window=CPS_WINDOW):
+        self.tiers = [Tier(width, capacity) for width, capacity in tiers]
+        self.tiers.append(CoarseTier(*coarse))
+        self.window = window
+        self.last = 0.0
+
+    def add(self, elapsed):
+        for tier in self.tiers:
+            tier.add(elapsed)
+        if elapsed > self.last:
+            self.last = elapsed
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+        self.last = 0.0
+
+    def __len__(self):
+        return sum(self.tiers[-1].counts)
+
+    def tier_for(self, until):
+        for tier in self.tiers:
+            if tier.covers_start() and until <= tier.width * tier.capacity:
+                return tier
+        return self.tiers[-1]
+
+    def points(self, until=None, max_points=None):
+        if until is None:
+            until = self.last
+        tier = self.tier_for(until)
+        if tier is self.tiers[-1]:
+            tier.extend_to(until)
+        width = tier.width
+        buckets = max(1, math.ceil(until / width))
+        counts = list(tier.counts)[:buckets]
+        counts.extend([0] * (buckets - len(counts)))
+
+        # CPS over a trailing window of whole buckets; once buckets are wider
+        # than the window, each bucket is its own rate.
+        span = max(1, round(self.window / width))
+        xs, ys = [], []
+        running = 0
+        for i, count in enumerate(counts):
+            running += count
+            if i >= span:
+                running -= counts[i - span]
+            xs.append((i + 1) * width)
+            ys.append(running / (span * width))
+
+        if max_points is not None and len(xs) > max_points:
+            xs, ys = lttb(xs, ys, max_points)
+        return xs, ys
+
+
+def lttb(xs, ys, threshold):
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+
+    out_x, out_y = [xs[0]], [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle.
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        a = best
+
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
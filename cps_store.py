@@ -0,0 +1,210 @@
+import itertools
+import json
+import os
+import sqlite3
+import threading
+
+SESSION_FIELDS = ['timestamp', 'mode', 'time_limit', 'total_clicks',
+                  'total_time', 'final_cps', 'max_cps']
+
+
+def split_session(session):
+    core = [session.get(field) for field in SESSION_FIELDS]
+    extra = {k: v for k, v in session.items() if k not in SESSION_FIELDS}
+    return core, (json.dumps(extra) if extra else None)
+
+
+def matches(session, mode=None, time_limit=None, since=None, until=None):
+    if mode is not None and session['mode'] != mode:
+        return False
+    if time_limit is not None and session['time_limit'] != time_limit:
+        return False
+    if since is not None and session['timestamp'] < since:
+        return False
+    if until is not None and session['timestamp'] >= until:
+        return False
+    return True
+
+
+class MemorySessionStore:
+    def __init__(self):
+        self.sessions = []
+
+    def append(self, session):
+        self.sessions.append(dict(session))
+        return len(self.sessions)
+
+    def append_many(self, sessions):
+        for session in sessions:
+            self.append(session)
+
+    def count(self, **filters):
+        return sum(1 for _ in self.iter_sessions(**filters))
+
+    def iter_sessions(self, mode=None, time_limit=None, since=None, until=None, newest_first=False):
+        sessions = reversed(self.sessions) if newest_first else self.sessions
+        for session in sessions:
+            if matches(session, mode, time_limit, since, until):
+                yield dict(session)
+
+    def iter_rows(self, fields, solo=False):
+        for session in self.sessions:
+            if solo and 'player' in session:
+                continue
+            yield tuple(session.get(field) for field in fields)
+
+    def recent(self, limit=10, **filters):
+        result = []
+        for session in self.iter_sessions(newest_first=True, **filters):
+            result.append(session)
+            if len(result) >= limit:
+                break
+        return result
+
+    def close(self):
+        pass
+
+
+class SqliteSessionStore:
+    def __init__(self, path='sessions.db'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    time_limit INTEGER,
+                    total_clicks INTEGER,
+                    total_time REAL,
+                    final_cps REAL,
+                    max_cps REAL,
+                    extra TEXT
+                )''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_mode_limit '
+                              'ON sessions (mode, time_limit, timestamp)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_timestamp '
+                              'ON sessions (timestamp)')
+
+    def append(self, session):
+        core, extra = split_session(session)
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO sessions (timestamp, mode, time_limit, total_clicks, '
+                'total_time, final_cps, max_cps, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                core + [extra])
+        return cursor.lastrowid
+
+    def append_many(self, sessions):
+        rows = []
+        for session in sessions:
+            core, extra = split_session(session)
+            rows.append(core + [extra])
+        with self.lock, self.conn:
+            self.conn.executemany(
+                'INSERT INTO sessions (timestamp, mode, time_limit, total_clicks, '
+                'total_time, final_cps, max_cps, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows)
+
+    def where(self, mode=None, time_limit=None, since=None, until=None):
+        clauses, params = [], []
+        if mode is not None:
+            clauses.append('mode = ?')
+            params.append(mode)
+        if time_limit is not None:
+            clauses.append('time_limit = ?')
+            params.append(time_limit)
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('timestamp < ?')
+            params.append(until)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def count(self, **filters):
+        clause, params = self.where(**filters)
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM sessions' + clause, params).fetchone()[0]
+
+    def iter_sessions(self, mode=None, time_limit=None, since=None, until=None,
+                      newest_first=False, batch_size=1000):
+        clause, params = self.where(mode, time_limit, since, until)
+        order = ' ORDER BY timestamp DESC, id DESC' if newest_first else ' ORDER BY timestamp, id'
+        last = None
+        # Page through by (timestamp, id) so the lock is only held per batch
+        # and a long export never pins the whole table in memory.
+        while True:
+            page_clause, page_params = clause, list(params)
+            if last is not None:
+                op = '<' if newest_first else '>'
+                page_clause += (' AND ' if page_clause else ' WHERE ') + f'(timestamp, id) {op} (?, ?)'
+                page_params += list(last)
+            with self.lock:
+                rows = self.conn.execute(
+                    'SELECT * FROM sessions' + page_clause + order + ' LIMIT ?',
+                    page_params + [batch_size]).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self.to_session(row)
+            last = (rows[-1]['timestamp'], rows[-1]['id'])
+
+    def iter_rows(self, fields, solo=False, batch_size=5000):
+        unknown = set(fields) - set(SESSION_FIELDS)
+        if unknown:
+            raise ValueError(f"not a session column: {', '.join(sorted(unknown))}")
+        # Multiplayer sessions keep the player's name in the extra column.
+        where = " WHERE extra IS NULL OR json_extract(extra, '$.player') IS NULL" if solo else ""
+        with self.lock:
+            cursor = self.conn.execute(f"SELECT {', '.join(fields)} FROM sessions{where} ORDER BY timestamp, id")
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            yield from rows
+            with self.lock:
+                rows = cursor.fetchmany(batch_size)
+
+    def recent(self, limit=10, **filters):
+        sessions = self.iter_sessions(newest_first=True, batch_size=max(1, limit), **filters)
+        return list(itertools.islice(sessions, limit))
+
+    def to_session(self, row):
+        session = {field: row[field] for field in SESSION_FIELDS}
+        if row['extra']:
+            session.update(json.loads(row['extra']))
+        return session
+
+    def migrate_json(self, path='session_data.json'):
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r') as f:
+                sessions = json.load(f)
+        except Exception as e:
+            print(f"Failed to read {path} for migration: {e}")
+            return 0
+
+        self.append_many(sessions)
+        os.replace(path, path + '.migrated')
+        print(f"Migrated {len(sessions)} sessions from {path}")
+        return len(sessions)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def open_store(path='sessions.db', legacy_path='session_data.json'):
+    try:
+        store = SqliteSessionStore(path)
+    except sqlite3.Error as e:
+        print(f"Failed to open session store {path}: {e} - keeping history in memory")
+        return MemorySessionStore()
+    store.migrate_json(legacy_path)
+    return store
@@ -0,0 +1,36 @@
+import random
+
+
+def click_stream(cps, count=None, duration=None, jitter=0.0, start=0.0, seed=None):
+    if count is None and duration is None:
+        raise ValueError('click_stream needs a count or a duration')
+    rng = random.Random(seed)
+    interval = 1.0 / cps
+    t = start
+    n = 0
+    while (count is None or n < count) and (duration is None or t - start < duration):
+        yield t
+        n += 1
+        if jitter:
+            t += max(interval * 0.05, rng.gauss(interval, interval * jitter))
+        else:
+            t = start + n * interval
+
+
+def click_array(cps, duration, jitter=0.0, start=0.0, rng=None):
+    # Vectorised click_stream for bulk corpora: same interval model, drawn
+    # from a numpy Generator in one go instead of click by click.
+    import numpy as np
+    interval = 1.0 / cps
+    n = int(duration * cps * 1.5) + 16
+    while True:
+        if jitter:
+            if rng is None:
+                rng = np.random.default_rng()
+            intervals = np.maximum(interval * 0.05, rng.normal(interval, interval * jitter, n))
+            offsets = np.concatenate(([0.0], np.cumsum(intervals[:-1])))
+        else:
+            offsets = np.arange(n) * interval
+        if offsets[-1] >= duration:
+            return start + offsets[:np.searchsorted(offsets, duration, side='left')]
+        n *= 2
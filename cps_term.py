@@ -0,0 +1,195 @@
+import argparse
+import curses
+import locale
+
+from cps_core import GameCore, MODES, TIME_LIMITS
+from cps_input import parse_keys
+from cps_io import PersistenceWorker
+from cps_view import ViewModel, next_refresh_delay
+
+SPARK_BLOCKS = ' ▁▂▃▄▅▆▇█'
+SPARK_ASCII = ' .:-=+*#%@'
+KEY_NAMES = {'space': ' ', 'enter': '\n', 'return': '\n', 'tab': '\t'}
+STAT_LINES = ['timer', 'clicks', 'cps', 'max_cps', 'avg_cps']
+HELP = "[s] start/stop  [r] reset  [m] mode  [t] time limit  [q] quit"
+
+
+def key_chars(names):
+    return {KEY_NAMES.get(name.lower(), name) for name in names if len(KEY_NAMES.get(name.lower(), name)) == 1}
+
+
+def resample(values, width):
+    # One column per cell; when there are more points than columns keep the
+    # peak of each group so bursts stay visible.
+    if len(values) <= width:
+        return values
+    step = len(values) / width
+    return [max(values[int(i * step):max(int(i * step) + 1, int((i + 1) * step))]) for i in range(width)]
+
+
+def sparkline(values, width, chars=SPARK_BLOCKS):
+    values = resample(values, width)
+    top = max(values, default=0) or 1
+    levels = len(chars) - 1
+    return ''.join(chars[min(levels, int(round(v / top * levels)))] for v in values)
+
+
+class TerminalGame:
+    def __init__(self, stdscr, keys, mode="Time Trial", time_limit=10, db_path='sessions.db', unicode=True):
+        self.stdscr = stdscr
+        self.keys = keys
+        self.chars = SPARK_BLOCKS if unicode else SPARK_ASCII
+        self.core = GameCore(mode, time_limit)
+        self.view = ViewModel()
+        self.message = "Press [s] to start"
+        self.last_session = None
+        self.running = True
+
+        # The history database is only touched from the worker, so sqlite
+        # never sits between launch and the first frame.
+        self.db_path = db_path
+        self.store = None
+        self.io = PersistenceWorker(name='cps-term-io')
+        self.io.submit('store', self.open_store)
+
+    def open_store(self):
+        from cps_store import open_store
+        self.store = open_store(self.db_path, 'session_data.json')
+
+    def persist_sessions(self, sessions):
+        if self.store is not None:
+            self.store.append_many(sessions)
+
+    def start_game(self):
+        if self.core.start():
+            self.message = ""
+
+    def end_game(self, now=None):
+        session = self.core.end(now)
+        if session is None:
+            self.message = "No clicks recorded"
+            return
+        self.last_session = session
+        self.io.append('sessions', self.persist_sessions, session)
+        self.message = f"Game over - {session['total_clicks']} clicks, {session['final_cps']:.2f} CPS (max {session['max_cps']:.1f})"
+        if session['autoclick_flagged']:
+            self.message += f"  AUTO-CLICKER SUSPECTED ({session['autoclick_confidence']:.0%})"
+
+    def handle_key(self, key, now):
+        char = chr(key) if 0 <= key < 256 else None
+        if char in self.keys:
+            if self.core.game_active:
+                self.core.click(now)
+            else:
+                self.message = "Press [s] to start first!"
+        elif char in ('s', 'S'):
+            if self.core.game_active:
+                self.end_game(now)
+            else:
+                self.start_game()
+        elif char in ('r', 'R'):
+            self.core.reset()
+            self.message = "Press [s] to start"
+        elif char in ('m', 'M'):
+            self.core.set_mode(MODES[(MODES.index(self.core.game_mode) + 1) % len(MODES)])
+        elif char in ('t', 'T'):
+            limits = TIME_LIMITS
+            index = limits.index(self.core.time_limit) if self.core.time_limit in limits else -1
+            self.core.set_time_limit(limits[(index + 1) % len(limits)])
+        elif char in ('q', 'Q'):
+            if self.core.game_active:
+                self.end_game(now)
+            self.running = False
+
+    def put(self, row, text, attr=0):
+        height, width = self.stdscr.getmaxyx()
+        if row >= height:
+            return
+        try:
+            self.stdscr.addnstr(row, 0, text, width - 1, attr)
+        except curses.error:
+            pass
+
+    def draw(self, now):
+        self.view.update(self.core, now)
+        self.stdscr.erase()
+        width = self.stdscr.getmaxyx()[1]
+        limit = f" ({self.core.time_limit}s)" if self.core.game_mode == "Time Trial" else ""
+        self.put(0, f"CPS CLICKER - {self.core.game_mode}{limit}", curses.A_BOLD)
+        for row, name in enumerate(STAT_LINES, start=2):
+            self.put(row, self.view.values[name])
+        if self.core.game_active and self.core.auto_click_suspected():
+            self.put(7, "Auto-Clicker Suspected", curses.A_REVERSE)
+
+        _, ys = self.core.graph_points(now=now)
+        self.put(9, f"CPS over time (peak {max(ys, default=0):.1f})")
+        self.put(10, sparkline(ys, max(1, width - 1), self.chars))
+        self.put(12, self.message)
+        self.put(14, HELP, curses.A_DIM)
+        self.view.dirty.clear()
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def timeout(self, now):
+        if not self.core.game_active:
+            return -1
+        delay = next_refresh_delay(self.core, now)
+        remaining = self.core.remaining(now)
+        if remaining is not None:
+            delay = min(delay, remaining)
+        return max(1, int(delay * 1000))
+
+    def run(self):
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        while self.running:
+            now = self.core.clock()
+            if self.core.expired(now):
+                self.end_game(self.core.deadline())
+            self.draw(now)
+
+            self.stdscr.timeout(self.timeout(now))
+            key = self.stdscr.getch()
+            # Stamp each key as soon as it is read, then drain anything that
+            # queued up while drawing so a burst is not spread over frames.
+            self.stdscr.timeout(0)
+            while key != -1 and self.running:
+                self.handle_key(key, self.core.clock())
+                key = self.stdscr.getch()
+        self.io.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CPS Clicker Game (terminal)")
+    parser.add_argument('--mode', choices=MODES, default="Time Trial")
+    parser.add_argument('--time-limit', type=int, choices=TIME_LIMITS, default=10)
+    parser.add_argument('--keys', default='space',
+                        help="comma-separated click keys, e.g. 'space,j,k' (default: space)")
+    parser.add_argument('--db', default='sessions.db', help="session history database")
+    parser.add_argument('--ascii', action='store_true', help="draw the sparkline with plain ASCII")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    keys = key_chars(parse_keys(args.keys))
+    if not keys:
+        raise SystemExit("No usable click keys given")
+    locale.setlocale(locale.LC_ALL, '')
+    unicode = not args.ascii and locale.getpreferredencoding(False).lower().replace('-', '') == 'utf8'
+
+    def play(stdscr):
+        game = TerminalGame(stdscr, keys, args.mode, args.time_limit, args.db, unicode)
+        game.run()
+        return game.last_session
+
+    session = curses.wrapper(play)
+    if session is not None:
+        print(f"Last game: {session['total_clicks']} clicks in {session['total_time']:.2f}s - "
+              f"{session['final_cps']:.2f} CPS (max {session['max_cps']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
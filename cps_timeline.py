@@ -0,0 +1,64 @@
+from array import array
+
+CHUNK_SIZE = 4096
+
+
+class ClickTimeline:
+    def __init__(self, origin=0.0, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.reset(origin)
+
+    def reset(self, origin=0.0):
+        self.origin = origin
+        self.chunks = []
+        self.fill = self.chunk_size
+        self.length = 0
+
+    def append(self, t):
+        # Chunks are allocated full-size up front and filled by index, so a
+        # click never triggers an array resize or copy of earlier clicks.
+        if self.fill == self.chunk_size:
+            self.chunks.append(array('d', bytes(8 * self.chunk_size)))
+            self.fill = 0
+        self.chunks[-1][self.fill] = t - self.origin
+        self.fill += 1
+        self.length += 1
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('timeline index out of range')
+        return self.chunks[index // self.chunk_size][index % self.chunk_size]
+
+    def __iter__(self):
+        for view in self.views():
+            yield from view
+
+    @property
+    def nbytes(self):
+        return 8 * self.length
+
+    def views(self):
+        for i, chunk in enumerate(self.chunks):
+            size = self.fill if i == len(self.chunks) - 1 else self.chunk_size
+            yield memoryview(chunk)[:size]
+
+    def to_numpy(self):
+        import numpy as np
+        views = list(self.views())
+        if not views:
+            return np.empty(0, dtype=np.float64)
+        if len(views) == 1:
+            return np.frombuffer(views[0], dtype=np.float64)
+        return np.concatenate([np.frombuffer(view, dtype=np.float64) for view in views])
+
+    def copy(self):
+        timeline = ClickTimeline(self.origin, self.chunk_size)
+        timeline.chunks = [array('d', chunk) for chunk in self.chunks]
+        timeline.fill = self.fill
+        timeline.length = self.length
+        return timeline
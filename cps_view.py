@@ -0,0 +1,48 @@
+ACTIVE_REFRESH = 0.05
+
+_MISSING = object()
+
+
+class ViewModel:
+    def __init__(self):
+        self.values = {}
+        self.dirty = set()
+        self.bindings = {}
+
+    def bind(self, name, apply):
+        self.bindings[name] = apply
+        self.dirty.add(name)
+
+    def set(self, name, value):
+        if self.values.get(name, _MISSING) != value:
+            self.values[name] = value
+            self.dirty.add(name)
+
+    def flush(self):
+        pushed = 0
+        for name in self.dirty:
+            apply = self.bindings.get(name)
+            if apply is not None and name in self.values:
+                apply(self.values[name])
+                pushed += 1
+        self.dirty.clear()
+        return pushed
+
+    def update(self, core, now):
+        self.set('clicks', f"Total Clicks: {core.clicks}")
+        self.set('cps', f"Current CPS: {core.smoothed_cps(now):.1f}")
+        self.set('max_cps', f"Max CPS: {core.max_cps:.1f}")
+        self.set('avg_cps', f"Average CPS: {core.average_cps(now):.1f}")
+        if not core.game_active:
+            self.set('timer', "Game Ready - Click Start!")
+        elif core.game_mode == "Time Trial":
+            self.set('timer', f"Time Remaining: {core.remaining(now):.1f}s")
+        else:
+            self.set('timer', f"Elapsed Time: {core.elapsed(now):.1f}s")
+
+
+def next_refresh_delay(core, now, interval=ACTIVE_REFRESH):
+    # Align ticks to the game clock rather than chaining fixed delays, so the
+    # tenths on the timer flip on time and scheduling error never accumulates.
+    elapsed = core.elapsed(now)
+    return interval - (elapsed % interval)
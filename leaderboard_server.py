@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import time
+from collections import OrderedDict
+
+from cps_io import atomic_write_json
+
+TOP_K = 100
+MAX_LINE = 1 << 20
+RECENT_IDS = 100_000
+
+
+class Board:
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.keys = []
+        self.entries = []
+
+    def add(self, entry):
+        # Sorted ascending by (-cps, submitted order), so index 0 is the leader.
+        # Returns the entry that is not on the board afterwards: the one pushed
+        # off the end, entry itself if it did not make it, or None.
+        key = (-entry['final_cps'], entry['seq'])
+        if len(self.keys) >= self.k and key >= self.keys[-1]:
+            return entry
+        index = bisect.bisect_left(self.keys, key)
+        self.keys.insert(index, key)
+        self.entries.insert(index, entry)
+        if len(self.keys) > self.k:
+            self.keys.pop()
+            return self.entries.pop()
+        return None
+
+    def top(self, k):
+        return self.entries[:k]
+
+
+class Leaderboard:
+    def __init__(self, k=TOP_K, recent_ids=RECENT_IDS):
+        self.k = k
+        self.boards = {}
+        # A board's cut-off only ever rises, so a resent session that is not
+        # on a board can never get onto one; only ids on the boards must be
+        # remembered for good.  recent catches ordinary retries cheaply and
+        # is bounded.
+        self.ids = set()
+        self.recent = OrderedDict()
+        self.recent_ids = recent_ids
+        self.seq = 0
+        self.dirty = False
+
+    def submit(self, session):
+        sid = session.get('id')
+        if sid is not None:
+            if sid in self.ids or sid in self.recent:
+                return False
+            self.recent[sid] = None
+            if len(self.recent) > self.recent_ids:
+                self.recent.popitem(last=False)
+        self.seq += 1
+        entry = {
+            'id': sid,
+            'station': str(session.get('station', '')),
+            'player': str(session.get('player', '')),
+            'mode': str(session['mode']),
+            'time_limit': int(session['time_limit']),
+            'final_cps': float(session['final_cps']),
+            'total_clicks': int(session.get('total_clicks', 0)),
+            'timestamp': str(session.get('timestamp', '')),
+            'seq': self.seq,
+        }
+        key = (entry['mode'], entry['time_limit'])
+        board = self.boards.get(key)
+        if board is None:
+            board = self.boards[key] = Board(self.k)
+        dropped = board.add(entry)
+        if dropped is not entry:
+            self.dirty = True
+            if sid is not None:
+                self.ids.add(sid)
+            if dropped is not None:
+                self.ids.discard(dropped['id'])
+        return True
+
+    def top(self, mode, time_limit, k=10):
+        board = self.boards.get((mode, int(time_limit)))
+        return board.top(min(k, self.k)) if board else []
+
+    def snapshot(self):
+        # Only what is on the boards, so the size follows top-k, not the
+        # number of sessions ever submitted.
+        return {
+            'seq': self.seq,
+            'entries': [entry for board in self.boards.values() for entry in board.entries],
+        }
+
+    @classmethod
+    def restore(cls, data, k=TOP_K):
+        leaderboard = cls(k)
+        for entry in sorted(data.get('entries', []), key=lambda e: e['seq']):
+            leaderboard.submit(entry)
+        leaderboard.seq = max(leaderboard.seq, data.get('seq', 0))
+        leaderboard.dirty = False
+        return leaderboard
+
+
+class LeaderboardServer:
+    def __init__(self, leaderboard, snapshot_path=None, snapshot_interval=30.0):
+        self.leaderboard = leaderboard
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.connections = 0
+        self.requests = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self.reply(writer, {'ok': False, 'error': 'request too large'})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    response = self.dispatch(json.loads(line))
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                await self.reply(writer, response)
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def reply(self, writer, response):
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == 'submit':
+            accepted = sum(self.leaderboard.submit(session) for session in request.get('sessions', []))
+            return {'ok': True, 'accepted': accepted}
+        if op == 'top':
+            entries = self.leaderboard.top(request['mode'], request['time_limit'], int(request.get('k', 10)))
+            return {'ok': True, 'entries': entries}
+        if op == 'ping':
+            return {'ok': True, 'time': time.time()}
+        raise ValueError(f"unknown op: {op}")
+
+    async def snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            await self.save_snapshot()
+
+    async def save_snapshot(self):
+        if not self.snapshot_path or not self.leaderboard.dirty:
+            return
+        data = self.leaderboard.snapshot()
+        self.leaderboard.dirty = False
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, atomic_write_json, self.snapshot_path, data)
+
+    async def serve(self, host, port, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=4096)
+        addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Leaderboard listening on {addresses}")
+        if ready is not None:
+            ready.set_result(server.sockets[0].getsockname()[1])
+        snapshots = asyncio.create_task(self.snapshot_loop()) if self.snapshot_path else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if snapshots is not None:
+                snapshots.cancel()
+            await self.save_snapshot()
+
+
+def load_leaderboard(path, k=TOP_K):
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            return Leaderboard.restore(json.load(f), k)
+    return Leaderboard(k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared CPS leaderboard server")
+    parser.add_argument('--host', default='127.0.0.1', help="use 0.0.0.0 to serve the LAN")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--snapshot', default='leaderboard.json')
+    parser.add_argument('--snapshot-interval', type=float, default=30.0)
+    parser.add_argument('--top-k', type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    server = LeaderboardServer(load_leaderboard(args.snapshot, args.top_k),
+                               args.snapshot, args.snapshot_interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
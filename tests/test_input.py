@@ -0,0 +1,78 @@
+from cps_input import KeyRepeatFilter
+
+
+class FakeRoot:
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, ms, func, *args):
+        self.next_id += 1
+        self.timers[self.next_id] = (func, args)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def run_timers(self):
+        timers, self.timers = self.timers, {}
+        for func, args in timers.values():
+            func(*args)
+
+
+def make_filter():
+    root = FakeRoot()
+    return root, KeyRepeatFilter(root, ['space'])
+
+
+def test_other_keys_ignored():
+    _, keys = make_filter()
+    assert not keys.press('a', 100)
+
+
+def test_held_key_counts_once():
+    _, keys = make_filter()
+    assert keys.press('space', 100)
+    assert not keys.press('space', 130)
+
+
+def test_x11_autorepeat_pair_is_not_a_click():
+    root, keys = make_filter()
+    assert keys.press('space', 100)
+    # X11 auto-repeat: a release immediately followed by a press with the
+    # same timestamp.
+    keys.release('space', 600)
+    assert not keys.press('space', 600)
+    assert not root.timers
+    keys.release('space', 633)
+    assert not keys.press('space', 633)
+    assert 'space' in keys.down
+
+
+def test_fast_repress_counts():
+    root, keys = make_filter()
+    assert keys.press('space', 100)
+    keys.release('space', 140)
+    # A genuine press arriving before the deferred release has fired.
+    assert keys.press('space', 155)
+    assert not root.timers
+    assert not keys.press('space', 170)
+
+
+def test_release_completes_after_delay():
+    root, keys = make_filter()
+    assert keys.press('space', 100)
+    keys.release('space', 150)
+    assert 'space' in keys.down
+    root.run_timers()
+    assert not keys.down and not keys.pending
+    assert keys.press('space', 400)
+
+
+def test_set_keys_cancels_pending_release():
+    root, keys = make_filter()
+    keys.press('space', 100)
+    keys.release('space', 150)
+    keys.set_keys(['a'])
+    assert not root.timers and not keys.down
+    assert keys.press('a', 200)
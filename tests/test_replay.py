@@ -0,0 +1,88 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from cps_core import GameCore, ScriptedDriver
+from cps_replay import (HEADER, MAX_VARINT, META_FIELDS, TICK_NS, _decode_varints_py, decode_varints,
+                        encode_varints, pack_replay, parse_replay, verify)
+
+DECODERS = [decode_varints, _decode_varints_py]
+
+
+def offsets_of(replay, decoder):
+    ticks = np.cumsum(np.asarray(decoder(replay.payload, replay.count), dtype=np.uint64))
+    return ticks * (replay.tick_ns / 1e9)
+
+
+def play(timestamps, mode="Time Trial", time_limit=10):
+    core = GameCore(mode, time_limit)
+    session = ScriptedDriver(core).run(timestamps)
+    return core, session
+
+
+@pytest.mark.parametrize('decoder', DECODERS)
+def test_round_trip(decoder):
+    offsets = np.cumsum(np.random.default_rng(1).exponential(0.12, 500))
+    meta = {'mode': "Endless Mode", 'time_limit': 10}
+    replay = parse_replay(pack_replay(offsets.tolist(), meta))
+    assert replay.meta == meta
+    assert replay.count == len(offsets)
+    assert np.allclose(offsets_of(replay, decoder), offsets, atol=TICK_NS / 1e9)
+
+
+@pytest.mark.parametrize('decoder', DECODERS)
+def test_wide_varints(decoder):
+    values = [0, 1, 127, 128, 16383, 16384, 2 ** 35, 2 ** 63 - 1]
+    assert [int(v) for v in decoder(encode_varints(values), len(values))] == values
+
+
+@pytest.mark.parametrize('decoder', DECODERS)
+def test_game_core_session(decoder):
+    timestamps = (100.0 + np.cumsum(np.full(80, 0.1))).tolist()
+    core, session = play(timestamps)
+    meta = {field: session[field] for field in META_FIELDS}
+    replay = parse_replay(pack_replay(core.timeline.copy(), meta))
+    assert replay.count == session['total_clicks']
+    assert np.allclose(offsets_of(replay, decoder), core.timeline.to_numpy(), atol=TICK_NS / 1e9)
+    assert verify(replay, full=True) == []
+
+
+def test_empty_replay():
+    replay = parse_replay(pack_replay([]))
+    assert len(replay.offsets()) == 0
+    assert _decode_varints_py(replay.payload, 0) == []
+
+
+@pytest.mark.parametrize('cut', [0, 4, HEADER.size - 1])
+def test_truncated_header(cut):
+    with pytest.raises(ValueError, match='header'):
+        parse_replay(pack_replay([0.1, 0.2])[:cut])
+
+
+def test_truncated_payload():
+    data = pack_replay([0.1, 0.2, 0.3], {'mode': "Time Trial"})
+    with pytest.raises(ValueError, match='truncated'):
+        parse_replay(data[:-1])
+
+
+def test_bad_magic_and_version():
+    data = bytearray(pack_replay([0.1]))
+    with pytest.raises(ValueError, match='not a replay'):
+        parse_replay(b'XXXX' + bytes(data[4:]))
+    data[4] = 99
+    with pytest.raises(ValueError, match='version'):
+        parse_replay(bytes(data))
+
+
+@pytest.mark.parametrize('decoder', DECODERS)
+def test_decoders_reject_short_payload(decoder):
+    with pytest.raises(ValueError, match='truncated'):
+        decoder(encode_varints([5, 300, 7]), 4)
+    with pytest.raises(ValueError, match='truncated'):
+        decoder(encode_varints([5, 300])[:-1], 2)
+
+
+@pytest.mark.parametrize('decoder', DECODERS)
+def test_decoders_reject_overlong_varint(decoder):
+    with pytest.raises(ValueError, match='corrupt'):
+        decoder(b'\x80' * MAX_VARINT + b'\x01', 1)
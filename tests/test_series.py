@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from cps_series import COARSE_CAPACITY, ClickSeries, CoarseTier, Tier, lttb
+
+
+def clicks(duration, cps=10, seed=0):
+    rng = random.Random(seed)
+    t, times = 0.0, []
+    while True:
+        t += rng.uniform(0.5, 1.5) / cps
+        if t >= duration:
+            return times
+        times.append(t)
+
+
+def test_tier_keeps_every_click_until_full():
+    tier = Tier(0.01, 2000)
+    times = clicks(19.9)
+    for t in times:
+        tier.add(t)
+    assert tier.covers_start()
+    assert sum(tier.counts) == len(times)
+
+
+def test_tier_rolls_over_past_capacity():
+    tier = Tier(0.01, 2000)
+    times = clicks(25.0)
+    for t in times:
+        tier.add(t)
+    assert len(tier.counts) == 2000
+    assert not tier.covers_start()
+    last = int(times[-1] / 0.01)
+    assert tier.first == last - 1999
+    assert sum(tier.counts) == sum(1 for t in times if int(t / 0.01) >= tier.first)
+
+
+def test_tier_gap_longer_than_capacity():
+    tier = Tier(0.1, 3000)
+    tier.add(1.0)
+    tier.add(1000.0)
+    assert len(tier.counts) == 3000
+    assert sum(tier.counts) == 1
+    assert tier.counts[-1] == 1
+
+
+def test_coarse_tier_halves_instead_of_dropping():
+    tier = CoarseTier(1.0, COARSE_CAPACITY)
+    times = clicks(COARSE_CAPACITY - 0.5, cps=1)
+    for t in times:
+        tier.add(t)
+    assert tier.width == 1.0
+    assert len(tier.counts) <= COARSE_CAPACITY
+    tier.add(COARSE_CAPACITY + 0.5)
+    assert tier.width == 2.0
+    assert len(tier.counts) == COARSE_CAPACITY // 2 + 1
+    assert sum(tier.counts) == len(times) + 1
+    tier.add(5 * COARSE_CAPACITY)
+    assert tier.width == 8.0
+    assert len(tier.counts) <= COARSE_CAPACITY
+    assert sum(tier.counts) == len(times) + 2
+
+
+@pytest.mark.parametrize('until, width', [(5.0, 0.01), (20.0, 0.01), (20.5, 0.1), (300.0, 0.1), (301.0, 1.0)])
+def test_tier_for_fresh_series(until, width):
+    series = ClickSeries()
+    assert series.tier_for(until).width == width
+
+
+def test_tier_for_skips_a_rolled_over_tier():
+    series = ClickSeries()
+    for t in clicks(30.0):
+        series.add(t)
+    # The 10 ms tier no longer reaches back to the start of the game.
+    assert series.tier_for(15.0).width == 0.1
+
+
+@pytest.mark.parametrize('duration', [10.0, 120.0, 900.0])
+def test_bucket_counts_sum_to_clicks(duration):
+    series = ClickSeries()
+    times = clicks(duration)
+    for t in times:
+        series.add(t)
+    assert len(series) == len(times)
+    tier = series.tier_for(duration)
+    assert tier.covers_start()
+    assert sum(tier.counts) == len(times)
+
+
+def test_points_cover_the_game():
+    series = ClickSeries()
+    for t in clicks(12.0):
+        series.add(t)
+    xs, ys = series.points(12.0)
+    assert len(xs) == len(ys) == 1200
+    assert xs[-1] == pytest.approx(12.0)
+    assert all(b > a for a, b in zip(xs, xs[1:]))
+    assert 5 < sum(ys[100:]) / len(ys[100:]) < 15
+
+
+def test_lttb_keeps_endpoints_and_size():
+    rng = random.Random(1)
+    xs = [i * 0.1 for i in range(1000)]
+    ys = [rng.random() for _ in xs]
+    out_x, out_y = lttb(xs, ys, 100)
+    assert len(out_x) == len(out_y) == 100
+    assert (out_x[0], out_y[0]) == (xs[0], ys[0])
+    assert (out_x[-1], out_y[-1]) == (xs[-1], ys[-1])
+    assert all(b > a for a, b in zip(out_x, out_x[1:]))
+    assert all(ys[xs.index(x)] == y for x, y in zip(out_x, out_y))
+
+
+@pytest.mark.parametrize('threshold', [3, 7, 999])
+def test_lttb_exact_threshold(threshold):
+    xs = list(range(1000))
+    ys = [(x * 37) % 11 for x in xs]
+    assert len(lttb(xs, ys, threshold)[0]) == threshold
+
+
+def test_lttb_small_input_unchanged():
+    xs, ys = [0, 1, 2], [5, 6, 7]
+    assert lttb(xs, ys, 10) == (xs, ys)
+    assert lttb(xs, ys, 2) == (xs, ys)
+
+
+def test_points_downsampled_to_max_points():
+    series = ClickSeries()
+    for t in clicks(60.0):
+        series.add(t)
+    xs, ys = series.points(60.0, max_points=200)
+    assert len(xs) == len(ys) == 200
+    assert xs[-1] == pytest.approx(60.0)